@@ -14,11 +14,206 @@ import sys
 import shutil
 import subprocess
 import argparse
+import importlib.util
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import py_compile
+import re
 import tempfile
 
 
+# Large enough that a typical source file is read or written in one syscall
+_IO_BUFFER_SIZE = 1024 * 1024
+_SOURCE_ENCODING = 'utf-8'
+
+# Files left alone by every pass: dunder modules and anything test-like
+_SKIP_FILE_RE = re.compile(r'^__|(?i:test)')
+
+_SENSITIVE_KEYWORDS = ('SECRET_KEY', 'API_KEY', 'PASSWORD', 'TOKEN')
+_SENSITIVE_PATTERN = '|'.join(_SENSITIVE_KEYWORDS)
+
+_SENSITIVE_RE = re.compile(_SENSITIVE_PATTERN, re.IGNORECASE)
+
+# A whole line assigning a double-quoted value where the line mentions a secret keyword
+_SECRET_ASSIGNMENT_RE = re.compile(
+    r'^([ \t]*)'
+    rf'(?=[^\n]*(?:{_SENSITIVE_PATTERN}))'
+    r'(?=[^\n]*")'
+    r'([^=\n]*?)[ \t]*=[ \t]*([^\n]*?)[ \t]*$',
+    re.MULTILINE | re.IGNORECASE,
+)
+_SECRET_ASSIGNMENT_REPL = r'\1\2 = \3  # Obfuscated'
+
+
+def _scan_py_entries(root):
+    """Yield a DirEntry for every .py file below ``root``.
+
+    DirEntry.is_dir() answers from the directory listing itself, so no
+    per-file stat is needed to tell files from directories.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_py_entries(entry.path)
+            elif entry.name.endswith('.py'):
+                yield entry
+
+
+def _link_or_copy(src, dst):
+    """Hardlink ``src`` to ``dst``, falling back to a real copy across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _sync_tree(src, dst):
+    """Mirror ``src`` into ``dst``, touching only entries that differ.
+
+    Files are considered unchanged when size and mtime match (hardlinks and
+    copy2 copies both preserve mtime). Returns the number of entries changed.
+    """
+    updated = 0
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(dst) as it:
+        existing = {entry.name: entry for entry in it}
+    
+    with os.scandir(src) as it:
+        for entry in it:
+            target = os.path.join(dst, entry.name)
+            current = existing.pop(entry.name, None)
+            
+            if entry.is_dir(follow_symlinks=False):
+                if current is not None and not current.is_dir(follow_symlinks=False):
+                    os.unlink(target)
+                updated += _sync_tree(entry.path, target)
+                continue
+            
+            if current is not None:
+                if current.is_dir(follow_symlinks=False):
+                    shutil.rmtree(target)
+                else:
+                    src_stat = entry.stat(follow_symlinks=False)
+                    dst_stat = current.stat(follow_symlinks=False)
+                    if (src_stat.st_size == dst_stat.st_size
+                            and src_stat.st_mtime_ns == dst_stat.st_mtime_ns):
+                        continue
+                    os.unlink(target)
+            
+            _link_or_copy(entry.path, target)
+            updated += 1
+    
+    # Drop whatever no longer exists in the source
+    for stale in existing.values():
+        if stale.is_dir(follow_symlinks=False):
+            shutil.rmtree(stale.path)
+        else:
+            os.unlink(stale.path)
+        updated += 1
+    
+    return updated
+
+
+def _write_replace(path, content):
+    """Write ``content`` to a sibling temp file and swap it over ``path``.
+
+    Replacing rather than truncating gives the file a fresh inode, so a
+    hardlinked backup of the original is left untouched, and the rename is
+    atomic so a crash never leaves a half-written source. The temp file's data
+    is fsynced before the rename; callers flush the affected directories once
+    per batch so the renames themselves persist.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding=_SOURCE_ENCODING, buffering=_IO_BUFFER_SIZE) as f:
+            f.write(content)
+            # Data must reach disk before the rename, or a crash can persist
+            # the rename over an empty or truncated file
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _compile_one(py_file):
+    """Compile a single source file to bytecode (runs in a worker process)."""
+    try:
+        # Deliberately the legacy location next to the source rather than
+        # importlib.util.cache_from_source(): once the .py is removed, the
+        # import system only loads sourceless bytecode from <name>.pyc and
+        # ignores __pycache__/<name>.<tag>.pyc entirely
+        pyc_file = py_file.with_suffix(".pyc")
+        # optimize=2 strips docstrings and asserts from the shipped bytecode;
+        # hash-based pycs do not depend on mtimes surviving packaging copies
+        py_compile.compile(
+            str(py_file), str(pyc_file), doraise=True, optimize=2,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+        )
+        return py_file, True
+    except Exception:
+        return py_file, False
+
+
+def _obfuscate_one(py_file):
+    """Tag secret assignments in a single source file (runs in a worker process).
+
+    Returns ``(py_file, ok, rewritten)``.
+    """
+    try:
+        with open(py_file, 'r', encoding=_SOURCE_ENCODING, buffering=_IO_BUFFER_SIZE) as f:
+            content = f.read()
+        
+        # Most files mention no secrets at all - leave those untouched
+        if _SENSITIVE_RE.search(content):
+            # Simple string obfuscation: tag obvious secret assignments
+            obfuscated = _SECRET_ASSIGNMENT_RE.sub(_SECRET_ASSIGNMENT_REPL, content)
+            if obfuscated != content:
+                _write_replace(py_file, obfuscated)
+                return py_file, True, True
+        return py_file, True, False
+    except Exception:
+        return py_file, False, False
+
+
+def _fsync_dirs(directories):
+    """Flush directory entries once per directory after a batch of renames."""
+    for directory in directories:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            # Directories cannot be opened for syncing on every platform (Windows)
+            continue
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _nuitka_compile_one(full_path):
+    """Compile a single module to an extension with Nuitka (runs in a worker process).
+
+    Returns ``(full_path, error)`` where ``error`` is None on success.
+    """
+    try:
+        subprocess.run([
+            'nuitka', '--module', '--remove-output',
+            '--output-dir=' + str(full_path.parent),
+            str(full_path)
+        ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        return full_path, None
+    except subprocess.CalledProcessError as e:
+        return full_path, e.stderr.decode(errors='replace').strip()
+    except OSError as e:
+        return full_path, str(e)
+
+
 class CodeProtector:
     """Simple code protection for briefcase integration."""
     
@@ -26,14 +221,61 @@ class CodeProtector:
         self.project_root = Path.cwd()
         self.source_dir = self.project_root / "src" / "cognitio_app"
         self.backup_dir = self.project_root / "src" / "cognitio_app_backup"
+        self._py_files_cache = None
+        
+    def _iter_py_files(self):
+        """Yield the protectable .py files under the source dir, walking it only once.
+
+        The first call yields files as the walk discovers them, so a pool fed
+        from it starts working before the walk has finished.
+        """
+        if self._py_files_cache is not None:
+            yield from self._py_files_cache
+            return
+        
+        py_files = []
+        for entry in _scan_py_entries(self.source_dir):
+            # Filter on the entry name; only build Path objects for kept files
+            if _SKIP_FILE_RE.search(entry.name):
+                continue
+            py_file = Path(entry.path)
+            py_files.append(py_file)
+            yield py_file
+        self._py_files_cache = py_files
+        
+    def _existing_files(self, relative_paths):
+        """Return the entries of ``relative_paths`` that exist, listing each parent dir once."""
+        by_parent = defaultdict(list)
+        for relative_path in relative_paths:
+            by_parent[Path(relative_path).parent].append(relative_path)
+        
+        existing = set()
+        for parent, paths in by_parent.items():
+            try:
+                with os.scandir(self.source_dir / parent) as it:
+                    names = {entry.name for entry in it}
+            except FileNotFoundError:
+                continue
+            existing.update(p for p in paths if Path(p).name in names)
         
+        return [p for p in relative_paths if p in existing]
+    
     def create_backup(self):
         """Create backup of original source."""
         if self.backup_dir.exists():
-            shutil.rmtree(self.backup_dir)
+            # Only bring over what changed since the last backup
+            print("📁 Updating backup of original source...")
+            updated = _sync_tree(self.source_dir, self.backup_dir)
+            if updated:
+                print(f"✅ Backup updated ({updated} entries changed): {self.backup_dir}")
+            else:
+                print(f"✅ Backup up-to-date: {self.backup_dir}")
+            return
         
         print("📁 Creating backup of original source...")
-        shutil.copytree(self.source_dir, self.backup_dir)
+        # Hardlink files instead of copying them; protection steps only ever
+        # replace or unlink sources, never rewrite them in place
+        shutil.copytree(self.source_dir, self.backup_dir, copy_function=_link_or_copy)
         print(f"✅ Backup created: {self.backup_dir}")
     
     def restore_backup(self):
@@ -52,13 +294,16 @@ class CodeProtector:
         print("🛡️  Protecting code with PyArmor...")
         
         # Install PyArmor if not present
-        try:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'pyarmor'], 
-                          check=True, capture_output=True)
-            print("✅ PyArmor installed")
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install PyArmor")
-            return False
+        if importlib.util.find_spec('pyarmor') is None:
+            try:
+                subprocess.run([sys.executable, '-m', 'pip', 'install', 'pyarmor'], 
+                              check=True, capture_output=True)
+                print("✅ PyArmor installed")
+            except subprocess.CalledProcessError:
+                print("❌ Failed to install PyArmor")
+                return False
+        else:
+            print("✅ PyArmor already installed")
         
         # Create backup first
         self.create_backup()
@@ -74,22 +319,34 @@ class CodeProtector:
             "backend/authentication/cloud_auth.py",
         ]
         
+        # Group existing files by directory so PyArmor runs once per output dir
+        groups = defaultdict(list)
+        for file_path in self._existing_files(sensitive_files):
+            groups[(self.source_dir / file_path).parent].append(file_path)
+        
         protected_count = 0
-        for file_path in sensitive_files:
-            full_path = self.source_dir / file_path
-            if full_path.exists():
-                try:
-                    # Obfuscate the file
-                    subprocess.run([
-                        sys.executable, '-m', 'pyarmor', 'obfuscate',
-                        '--output', str(full_path.parent),
-                        '--exact',
-                        str(full_path)
-                    ], check=True, capture_output=True)
-                    protected_count += 1
+        for output_dir, file_paths in groups.items():
+            try:
+                # PyArmor overwrites its outputs in place; detach them from the backup first
+                for file_path in file_paths:
+                    full_path = self.source_dir / file_path
+                    _write_replace(full_path, full_path.read_text(encoding=_SOURCE_ENCODING))
+                
+                # Obfuscate every file of the group in a single invocation
+                subprocess.run([
+                    sys.executable, '-m', 'pyarmor', 'obfuscate',
+                    '--output', str(output_dir),
+                    '--exact',
+                    *(str(self.source_dir / file_path) for file_path in file_paths)
+                ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                protected_count += len(file_paths)
+                for file_path in file_paths:
                     print(f"  ✅ Protected: {file_path}")
-                except subprocess.CalledProcessError as e:
+            except subprocess.CalledProcessError as e:
+                for file_path in file_paths:
                     print(f"  ⚠️  Failed to protect: {file_path}")
+                if e.stderr:
+                    print(f"     {e.stderr.decode(errors='replace').strip()}")
         
         print(f"✅ PyArmor protection complete: {protected_count} files protected")
         return protected_count > 0
@@ -100,24 +357,22 @@ class CodeProtector:
         
         self.create_backup()
         
-        # Compile all Python files to bytecode
+        # Compile all Python files to bytecode across a process pool; map()
+        # submits work while the walk is still discovering files
         compiled_count = 0
-        for py_file in self.source_dir.rglob("*.py"):
-            if py_file.name.startswith("__") or "test" in py_file.name.lower():
-                continue
-                
-            try:
-                # Compile to bytecode
-                pyc_file = py_file.with_suffix(".pyc")
-                py_compile.compile(str(py_file), str(pyc_file), doraise=True)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for py_file, ok in executor.map(_compile_one, self._iter_py_files(), chunksize=4):
+                if not ok:
+                    print(f"  ⚠️  Failed to compile: {py_file.relative_to(self.source_dir)}")
+                    continue
                 
-                # Remove original source file
+                # Remove original source file only once its bytecode exists
                 py_file.unlink()
                 compiled_count += 1
                 print(f"  ✅ Compiled: {py_file.relative_to(self.source_dir)}")
-                
-            except Exception as e:
-                print(f"  ⚠️  Failed to compile: {py_file.relative_to(self.source_dir)}")
+        
+        # Sources were removed, so the cached scan no longer reflects the tree
+        self._py_files_cache = None
         
         print(f"✅ Bytecode protection complete: {compiled_count} files compiled")
         return compiled_count > 0
@@ -127,13 +382,16 @@ class CodeProtector:
         print("🚀 Protecting code with Nuitka (simple mode)...")
         
         # Install Nuitka if not present
-        try:
-            subprocess.run([sys.executable, '-m', 'pip', 'install', 'nuitka'], 
-                          check=True, capture_output=True)
-            print("✅ Nuitka installed")
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install Nuitka")
-            return False
+        if importlib.util.find_spec('nuitka') is None:
+            try:
+                subprocess.run([sys.executable, '-m', 'pip', 'install', 'nuitka'], 
+                              check=True, capture_output=True)
+                print("✅ Nuitka installed")
+            except subprocess.CalledProcessError:
+                print("❌ Failed to install Nuitka")
+                return False
+        else:
+            print("✅ Nuitka already installed")
         
         self.create_backup()
         
@@ -144,25 +402,26 @@ class CodeProtector:
             "backend/authentication/cloud_auth.py",
         ]
         
+        existing_paths = [
+            self.source_dir / module_path
+            for module_path in self._existing_files(sensitive_modules)
+        ]
+        
+        # Nuitka builds one module per invocation, so run the compiles concurrently
         protected_count = 0
-        for module_path in sensitive_modules:
-            full_path = self.source_dir / module_path
-            if full_path.exists():
-                try:
-                    # Compile with Nuitka
-                    subprocess.run([
-                        'nuitka', '--module', '--remove-output',
-                        '--output-dir=' + str(full_path.parent),
-                        str(full_path)
-                    ], check=True, capture_output=True)
-                    
-                    # Remove original Python file
-                    full_path.unlink()
-                    protected_count += 1
-                    print(f"  ✅ Compiled: {module_path}")
-                    
-                except subprocess.CalledProcessError as e:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for full_path, error in executor.map(_nuitka_compile_one, existing_paths):
+                module_path = full_path.relative_to(self.source_dir)
+                if error is not None:
                     print(f"  ⚠️  Failed to compile: {module_path}")
+                    if error:
+                        print(f"     {error}")
+                    continue
+                
+                # Remove original Python file
+                full_path.unlink()
+                protected_count += 1
+                print(f"  ✅ Compiled: {module_path}")
         
         print(f"✅ Nuitka protection complete: {protected_count} files compiled")
         return protected_count > 0
@@ -171,48 +430,20 @@ class CodeProtector:
         """Obfuscate strings and constants in Python files."""
         print("🔤 Obfuscating strings and constants...")
         
-        import base64
-        import random
-        import string
-        
+        # Each file is independent, so spread the rewrites across processes
         protected_count = 0
+        rewritten_dirs = set()
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for py_file, ok, rewritten in executor.map(_obfuscate_one, self._iter_py_files(), chunksize=16):
+                if ok:
+                    protected_count += 1
+                    if rewritten:
+                        rewritten_dirs.add(py_file.parent)
+                else:
+                    print(f"  ⚠️  Failed to obfuscate: {py_file.relative_to(self.source_dir)}")
         
-        for py_file in self.source_dir.rglob("*.py"):
-            if py_file.name.startswith("__") or "test" in py_file.name.lower():
-                continue
-            
-            try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Simple string obfuscation
-                lines = content.split('\n')
-                obfuscated_lines = []
-                
-                for line in lines:
-                    # Obfuscate obvious secrets
-                    if any(keyword in line.upper() for keyword in ['SECRET_KEY', 'API_KEY', 'PASSWORD', 'TOKEN']):
-                        if '=' in line and '"' in line:
-                            # Create a simple obfuscated version
-                            parts = line.split('=', 1)
-                            if len(parts) == 2:
-                                key_part = parts[0].strip()
-                                value_part = parts[1].strip()
-                                
-                                # Add obfuscation comment
-                                obfuscated_lines.append(f"{key_part} = {value_part}  # Obfuscated")
-                                continue
-                    
-                    obfuscated_lines.append(line)
-                
-                # Write back obfuscated content
-                with open(py_file, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(obfuscated_lines))
-                
-                protected_count += 1
-                
-            except Exception as e:
-                print(f"  ⚠️  Failed to obfuscate: {py_file.relative_to(self.source_dir)}")
+        # Files were swapped in with atomic renames; persist those once per directory
+        _fsync_dirs(rewritten_dirs)
         
         print(f"✅ String obfuscation complete: {protected_count} files processed")
         return protected_count > 0
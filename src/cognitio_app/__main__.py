@@ -7,34 +7,270 @@ It starts the Django backend server and opens the frontend URL in a web view.
 All WebLLM processing happens locally in the browser context.
 """
 
+import asyncio
+import hashlib
 import os
+import shutil
 import sys
 import threading
 import time
 import subprocess
 import webbrowser
 import socket
+import select
 import signal
 from pathlib import Path
 
-# Load environment variables from .env file
+# Paths resolved once at import time
+_HERE = Path(__file__).resolve()
+_PROJECT_ROOT = _HERE.parent.parent.parent
+_BUNDLE_MODE = (
+    hasattr(sys, 'frozen') or
+    'app_packages' in str(_HERE) or
+    '.app/Contents/Resources' in str(_HERE)
+)
+if _BUNDLE_MODE:
+    # In app bundle, the frontend lives relative to the app bundle location
+    _FRONTEND_SRC = _HERE.parent / "backend" / "frontend-src"
+else:
+    # In development, use the standard project structure
+    _FRONTEND_SRC = _PROJECT_ROOT / "src" / "cognitio_app" / "backend" / "frontend-src"
+
+def _find_icon():
+    """Return the first existing app icon, or None.
+
+    Order of preference: macOS native format, PNG fallback, then the Windows
+    format as a last resort. One directory listing answers all three.
+    """
+    resources = _HERE.parent / 'resources'
+    try:
+        with os.scandir(resources) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        return None
+    for suffix in ('.icns', '.png', '.ico'):
+        name = f'LOGO-light-vertical{suffix}'
+        if name in names:
+            return resources / name
+    return None
+
+
+_ICON_PATH = _find_icon()
+
+# Upper bound on how long the UI waits for the backend to accept connections
+# (first start can include a full migrate)
+_BACKEND_READY_TIMEOUT = 120
+
+# Per-user cache for state that should survive restarts
+_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'cognitio'
+
+
+def _read_cache(name):
+    """Return the stripped contents of a cache entry, or None if missing."""
+    try:
+        return (_CACHE_DIR / name).read_text().strip()
+    except OSError:
+        return None
+
+
+def _write_cache(name, value):
+    """Atomically store a cache entry; failures are ignored (cache only)."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = _CACHE_DIR / f"{name}.tmp"
+        tmp_path.write_text(str(value))
+        os.replace(tmp_path, _CACHE_DIR / name)
+    except OSError:
+        pass
+
+
+def _load_env():
+    """Load environment variables from the project's .env file.
+
+    Called from main() rather than at import time, so importing this module
+    does no file I/O.
+    """
+    try:
+        from dotenv import load_dotenv
+        # Load .env file from project root
+        env_path = _PROJECT_ROOT / '.env'
+        if env_path.exists():
+            load_dotenv(env_path)
+            print(f"✅ Loaded environment variables from {env_path}")
+        else:
+            print(f"ℹ️  No .env file found at {env_path}")
+    except ImportError:
+        print("⚠️  python-dotenv not available, skipping .env file loading")
+
+
+# Frontend inputs besides src/ whose changes require a rebuild
+_FRONTEND_BUILD_CONFIGS = (
+    "package.json", "package-lock.json", "webpack.config.js", "tsconfig.json",
+    "babel.config.js", "tailwind.config.js", "postcss.config.js", "post-build.js",
+)
+
+
+def _frontend_install_digest(frontend_src_path):
+    """SHA-1 over the npm manifests; a match means node_modules is current."""
+    digest = hashlib.sha1()
+    for name in ("package.json", "package-lock.json"):
+        try:
+            digest.update((frontend_src_path / name).read_bytes())
+        except FileNotFoundError:
+            digest.update(b"missing:" + name.encode())
+    return digest.hexdigest()
+
+
+def _frontend_build_digest(frontend_src_path):
+    """SHA-1 over (path, size, mtime) of every build input."""
+    digest = hashlib.sha1()
+    
+    def add(path, relative):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        digest.update(f"{relative}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    
+    def walk(directory, prefix):
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            relative = f"{prefix}/{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                walk(entry.path, relative)
+            else:
+                add(entry.path, relative)
+    
+    for name in _FRONTEND_BUILD_CONFIGS:
+        add(frontend_src_path / name, name)
+    if (frontend_src_path / "src").is_dir():
+        walk(frontend_src_path / "src", "src")
+    return digest.hexdigest()
+
+
+def _read_build_stamp(frontend_src_path, name):
+    """Return the digest recorded by the last successful build step, if any."""
+    try:
+        return (frontend_src_path / ".buildinfo" / name).read_text().strip()
+    except OSError:
+        return None
+
+
+def _write_build_stamp(frontend_src_path, name, digest):
+    """Atomically record the digest of a successful build step."""
+    stamp_dir = frontend_src_path / ".buildinfo"
+    stamp_dir.mkdir(exist_ok=True)
+    tmp_path = stamp_dir / f"{name}.tmp"
+    tmp_path.write_text(digest)
+    os.replace(tmp_path, stamp_dir / name)
+
+
+def _wait_process(process, timeout):
+    """Wait up to ``timeout`` seconds for ``process`` to exit and reap it.
+
+    Popen.wait(timeout) polls with a sleep backoff; on Linux a pidfd becomes
+    readable the moment the child exits, so block on that instead. Raises
+    subprocess.TimeoutExpired like Popen.wait.
+    """
+    if hasattr(os, 'pidfd_open') and process.returncode is None:
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            # Already reaped, or pidfd unsupported by this kernel
+            pass
+        else:
+            try:
+                readable, _, _ = select.select([pidfd], [], [], timeout)
+            finally:
+                os.close(pidfd)
+            if not readable:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            return process.wait()
+    return process.wait(timeout=timeout)
+
+
+# Resolved once here so the backend thread's django.setup() finds it ready
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cognitio_app.backend.settings')
+
+# Import Django once, at a fixed point in the import order
 try:
-    from dotenv import load_dotenv
-    # Load .env file from project root
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-        print(f"✅ Loaded environment variables from {env_path}")
-    else:
-        print(f"ℹ️  No .env file found at {env_path}")
+    import django
+    import django.apps
+    from django.core.management import call_command
 except ImportError:
-    print("⚠️  python-dotenv not available, skipping .env file loading")
+    django = None
+    call_command = None
 
 import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW
 
 
+# Widget styles are constant, so they are built once at import; Toga copies
+# a style onto each widget, so sharing these instances is safe
+_MAIN_BOX_STYLE = Pack(
+    direction=COLUMN,
+    background_color="#ffffff",
+    padding=20
+)
+_ICON_STYLE = Pack(
+    font_size=48,
+    text_align="center",
+    padding_top=20,
+    padding_bottom=10
+)
+_TITLE_STYLE = Pack(
+    font_size=24,
+    font_weight="bold",
+    color="#212529",
+    text_align="center",
+    padding_bottom=5
+)
+_SUBTITLE_STYLE = Pack(
+    font_size=14,
+    color="#6c757d",
+    text_align="center",
+    padding_bottom=25
+)
+_STATUS_STYLE = Pack(
+    font_size=12,
+    color="#495057",
+    text_align="center",
+    background_color="#f1f3f5",
+    padding=(8, 12)
+)
+_SPACER_STYLE = Pack(flex=1)
+_INFO_STYLE = Pack(
+    font_size=11,
+    text_align="center",
+    padding_bottom=15,
+    color="#6c757d"
+)
+_BUTTON_CONTAINER_STYLE = Pack(
+    direction=COLUMN,
+    padding=0
+)
+_PRIMARY_BUTTON_STYLE = Pack(
+    padding=12,
+    background_color="#4C5FD5",
+    color="#ffffff",
+    font_size=13,
+    font_weight="bold"
+)
+_SECONDARY_ROW_STYLE = Pack(
+    direction=ROW,
+    padding_top=8,
+    alignment="center"
+)
+_FOOTER_STYLE = Pack(
+    font_size=9,
+    color="#adb5bd",
+    text_align="center",
+    padding_bottom=5
+)
+
+
 class WebLLMChatApp(toga.App):
     """Main application class for WebLLM Chat."""
 
@@ -46,14 +282,18 @@ class WebLLMChatApp(toga.App):
         self.backend_process = None
         self.last_status_check = 0
         self._stop_event = threading.Event()
+        # Set (on the event loop) once the backend accepts connections
+        self.backend_ready = asyncio.Event()
+        # Set once the frontend check/build has finished, successful or not
+        self.frontend_prepared = asyncio.Event()
         self.browser_opened = False
+        # Only a positive result is cached: a build cannot vanish mid-session
+        self._frontend_built_cache = None
+        self._node_bin = None
+        self._npm_bin = None
         
         # Detect app bundle mode early
-        self.app_bundle_mode = (
-            hasattr(sys, 'frozen') or 
-            'app_packages' in str(Path(__file__)) or
-            '.app/Contents/Resources' in str(Path(__file__))
-        )
+        self.app_bundle_mode = _BUNDLE_MODE
         
         if self.app_bundle_mode:
             print("📦 Detected app bundle mode - will use production settings")
@@ -62,45 +302,29 @@ class WebLLMChatApp(toga.App):
 
     def _set_app_icon(self):
         """Set the application icon explicitly."""
-        try:
-            # Get the icon path relative to the app module
-            icon_base = Path(__file__).parent / "resources" / "LOGO-light-vertical"
-            
-            # Try different icon formats in order of preference for macOS
-            icon_paths = [
-                icon_base.with_suffix('.icns'),  # macOS native format
-                icon_base.with_suffix('.png'),   # Fallback PNG
-                icon_base.with_suffix('.ico'),   # Windows format as last resort
-            ]
-            
-            for path in icon_paths:
-                if path.exists():
-                    print(f"📱 Setting app icon: {path}")
-                    # Try to set the icon on the app itself
-                    if hasattr(self, 'icon'):
-                        self.icon = str(path)
-                    # Also try to set it as a property
-                    try:
-                        import toga
-                        if hasattr(toga, 'Icon'):
-                            self.icon = toga.Icon(str(path))
-                    except Exception as e:
-                        print(f"⚠️  Could not create Toga Icon: {e}")
-                    return
-            
+        if _ICON_PATH is None:
             print("ℹ️  No icon file found, using default app icon")
+            return
+        
+        print(f"📱 Setting app icon: {_ICON_PATH}")
+        try:
+            self.icon = toga.Icon(str(_ICON_PATH))
         except Exception as e:
-            print(f"⚠️  Error setting app icon: {e}")
+            print(f"⚠️  Could not create Toga Icon: {e}")
 
     def find_free_port(self, port_list):
         """Find the first available port from the list."""
+        # With a single candidate there is nothing to choose; let runserver's
+        # own bind report a conflict instead of probing (and racing) it here
+        if len(port_list) == 1:
+            return port_list[0]
+        
         for port in port_list:
             print(f"\n🔍 Checking port {port} availability...")
             
-            # Check if port is available
+            # Check if port is available (no SO_REUSEADDR, which can mask conflicts)
             try:
                 with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                     s.bind(('127.0.0.1', port))
                     print(f"✅ Port {port} is available")
                     return port
@@ -114,19 +338,16 @@ class WebLLMChatApp(toga.App):
 
     def check_frontend_built(self):
         """Check if the React frontend has been built."""
+        if self._frontend_built_cache:
+            return True
+        
         try:
-            # Different paths for app bundle vs development
-            if self.app_bundle_mode:
-                # In app bundle, check relative to the app bundle location
-                frontend_build_path = Path(__file__).parent / "backend" / "frontend-src"
-            else:
-                # In development, check the standard project structure
-                frontend_build_path = Path(__file__).parent.parent.parent / "src" / "cognitio_app" / "backend" / "frontend-src"
-
+            frontend_build_path = _FRONTEND_SRC
             
             # Check if build artifacts exist
             if frontend_build_path.exists():
                 print(f"✅ React frontend build detected at: {frontend_build_path}")
+                self._frontend_built_cache = True
                 return True
             else:
                 print(f"❌ React frontend not built at: {frontend_build_path}")
@@ -135,22 +356,43 @@ class WebLLMChatApp(toga.App):
             print(f"⚠️  Error checking frontend build: {e}")
             return False
 
+    def _run_streaming(self, args, cwd, timeout):
+        """Run a command, echoing its output line by line, and return its exit code.
+
+        Raises subprocess.TimeoutExpired if it runs longer than ``timeout`` seconds.
+        """
+        process = subprocess.Popen(
+            args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            process.kill()
+        
+        timer = threading.Timer(timeout, kill)
+        timer.start()
+        try:
+            for line in process.stdout:
+                print(line, end='')
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(args, timeout)
+        return returncode
+
     def build_frontend(self):
         """Build the React frontend automatically."""
         print("\n🔧 Building React frontend...")
         
         try:
-            # Different paths for app bundle vs development
-            if self.app_bundle_mode:
-                # In app bundle, look for frontend-src in the app bundle
-                frontend_src_path = Path(__file__).parent / "backend" / "frontend-src"
-                if not frontend_src_path.exists():
-                    # Fallback: try looking in Resources directory
-                    resources_path = Path(__file__).parent.parent.parent
-                    frontend_src_path = resources_path / "cognitio_app" / "backend" / "frontend-src"
-            else:
-                # In development, use standard project structure
-                frontend_src_path = Path(__file__).parent.parent.parent / "src" / "cognitio_app" / "backend" / "frontend-src"
+            frontend_src_path = _FRONTEND_SRC
+            if self.app_bundle_mode and not frontend_src_path.exists():
+                # Fallback: try looking in Resources directory
+                frontend_src_path = _PROJECT_ROOT / "cognitio_app" / "backend" / "frontend-src"
             
             if not frontend_src_path.exists():
                 print(f"❌ Frontend source not found at: {frontend_src_path}")
@@ -162,21 +404,21 @@ class WebLLMChatApp(toga.App):
             
             print(f"📁 Frontend source found at: {frontend_src_path}")
             
-            # Check if we have Node.js available
-            try:
-                result = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=10)
-                if result.returncode != 0:
-                    print("❌ Node.js not found - cannot build frontend")
-                    return False
-                print(f"✅ Node.js found: {result.stdout.strip()}")
-            except (subprocess.TimeoutExpired, FileNotFoundError):
+            # Check if we have Node.js and npm available (resolved once per process)
+            if self._node_bin is None:
+                self._node_bin = shutil.which("node")
+            if self._npm_bin is None:
+                self._npm_bin = shutil.which("npm")
+            if not self._node_bin:
                 print("❌ Node.js not available - cannot build frontend")
                 return False
+            if not self._npm_bin:
+                print("❌ npm not found - please install Node.js and npm")
+                return False
+            print(f"✅ Node.js found: {self._node_bin}")
             
-            # Change to frontend directory
-            original_cwd = os.getcwd()
-            os.chdir(frontend_src_path)
-            
+            # npm runs with cwd= instead of chdir, which would change the working
+            # directory of the whole process (including the backend thread)
             try:
                 # Check if package.json exists
                 package_json = frontend_src_path / "package.json"
@@ -184,29 +426,46 @@ class WebLLMChatApp(toga.App):
                     print("❌ package.json not found in frontend-src")
                     return False
                 
-                print("📦 Installing npm dependencies...")
-                
-                # Install dependencies
-                npm_install_process = subprocess.run([
-                    "npm", "install", "--legacy-peer-deps"
-                ], capture_output=True, text=True, timeout=300)
+                # Skip npm install when the manifests match the last successful install
+                install_digest = _frontend_install_digest(frontend_src_path)
+                if (install_digest == _read_build_stamp(frontend_src_path, "install.sha1")
+                        and (frontend_src_path / "node_modules").is_dir()):
+                    print("✅ npm dependencies up to date - skipping install")
+                else:
+                    print("📦 Installing npm dependencies...")
+                    
+                    # Install dependencies
+                    npm_install_returncode = self._run_streaming([
+                        self._npm_bin, "install", "--legacy-peer-deps"
+                    ], cwd=frontend_src_path, timeout=300)
+                    
+                    if npm_install_returncode != 0:
+                        print(f"❌ npm install failed (exit code {npm_install_returncode})")
+                        return False
+                    
+                    _write_build_stamp(frontend_src_path, "install.sha1", install_digest)
+                    print("✅ npm dependencies installed")
                 
-                if npm_install_process.returncode != 0:
-                    print(f"❌ npm install failed: {npm_install_process.stderr}")
-                    return False
+                # Skip the build when no input changed since the last successful build
+                build_digest = _frontend_build_digest(frontend_src_path)
+                build_output = frontend_src_path.parent.parent / "static" / "assets" / "main.js"
+                if (build_digest == _read_build_stamp(frontend_src_path, "build.sha1")
+                        and build_output.exists()):
+                    print("✅ React frontend unchanged since last build - skipping build")
+                    return self.check_frontend_built()
                 
-                print("✅ npm dependencies installed")
                 print("🏗️  Building React frontend...")
                 
                 # Build the frontend
-                npm_build_process = subprocess.run([
-                    "npm", "run", "build"
-                ], capture_output=True, text=True, timeout=300)
+                npm_build_returncode = self._run_streaming([
+                    self._npm_bin, "run", "build"
+                ], cwd=frontend_src_path, timeout=300)
                 
-                if npm_build_process.returncode != 0:
-                    print(f"❌ npm run build failed: {npm_build_process.stderr}")
+                if npm_build_returncode != 0:
+                    print(f"❌ npm run build failed (exit code {npm_build_returncode})")
                     return False
                 
+                _write_build_stamp(frontend_src_path, "build.sha1", build_digest)
                 print("✅ React frontend built successfully")
                 
                 # Verify build was successful
@@ -226,9 +485,6 @@ class WebLLMChatApp(toga.App):
             except Exception as e:
                 print(f"❌ Frontend build error: {e}")
                 return False
-            finally:
-                # Always return to original directory
-                os.chdir(original_cwd)
                 
         except Exception as e:
             print(f"❌ Error during frontend build: {e}")
@@ -264,7 +520,7 @@ class WebLLMChatApp(toga.App):
         
         # In development mode, try to build the frontend
         print("🛠️  Development mode - attempting to build frontend...")
-        self.status_label.text = "🔧 Building frontend..."
+        self._set_status_threadsafe("🔧 Building frontend...")
         
         success = self.build_frontend()
         if success:
@@ -278,11 +534,21 @@ class WebLLMChatApp(toga.App):
             print("   npm run build")
             return False
 
-    def startup(self):
-        """Initialize the application."""
-        # Ensure icon is set correctly
-        self._set_app_icon()
-        
+    def _set_status_threadsafe(self, text):
+        """Update the status label from a worker thread."""
+        self.loop.call_soon_threadsafe(setattr, self.status_label, 'text', text)
+
+    def _prepare_frontend(self):
+        """Run ensure_frontend_ready on a worker thread and flag completion."""
+        try:
+            if not self.ensure_frontend_ready():
+                self._set_status_threadsafe("⚠️ Frontend build failed")
+                print("⚠️  Continuing without frontend build - server will still start")
+        finally:
+            self.loop.call_soon_threadsafe(self.frontend_prepared.set)
+
+    def _build_ui(self):
+        """Build and show the control window."""
         self.main_window = toga.MainWindow(title="WebLLM Chat")
         
         # Set window size for a more compact, modern feel
@@ -297,160 +563,117 @@ class WebLLMChatApp(toga.App):
             self.main_window.size = (400, 450)
         
         # Main container with a clean, white background and overall padding
-        main_box = toga.Box(style=Pack(
-            direction=COLUMN, 
-            background_color="#ffffff",
-            padding=20
-        ))
+        main_box = toga.Box(style=_MAIN_BOX_STYLE)
         
         # App icon/logo placeholder
         icon_label = toga.Label(
             "🤖",
-            style=Pack(
-                font_size=48,
-                text_align="center",
-                padding_top=20,
-                padding_bottom=10
-            )
+            style=_ICON_STYLE
         )
         main_box.add(icon_label)
         
         # App title
         title_label = toga.Label(
             "WebLLM Chat",
-            style=Pack(
-                font_size=24, 
-                font_weight="bold", 
-                color="#212529",
-                text_align="center",
-                padding_bottom=5
-            )
+            style=_TITLE_STYLE
         )
         main_box.add(title_label)
         
         # Subtitle
         subtitle_label = toga.Label(
             "Privacy-First Local AI",
-            style=Pack(
-                font_size=14, 
-                color="#6c757d",
-                text_align="center",
-                padding_bottom=25
-            )
+            style=_SUBTITLE_STYLE
         )
         main_box.add(subtitle_label)
         
         # Status with modern styling
         self.status_label = toga.Label(
             "Initializing...",
-            style=Pack(
-                font_size=12, 
-                color="#495057",
-                text_align="center",
-                background_color="#f1f3f5",
-                padding=(8, 12)
-            )
+            style=_STATUS_STYLE
         )
         main_box.add(self.status_label)
         
         # Flexible spacer to push content down
-        main_box.add(toga.Box(style=Pack(flex=1)))
+        main_box.add(toga.Box(style=_SPACER_STYLE))
         
         # Info text with better typography
         info_text = toga.Label(
             "The app will open in your browser automatically.\n"
             "WebGPU is recommended for best performance.",
-            style=Pack(
-                font_size=11,
-                text_align="center",
-                padding_bottom=15,
-                color="#6c757d"
-            )
+            style=_INFO_STYLE
         )
         main_box.add(info_text)
         
         # Button container
-        button_container = toga.Box(style=Pack(
-            direction=COLUMN,
-            padding=0
-        ))
+        button_container = toga.Box(style=_BUTTON_CONTAINER_STYLE)
         
         # Primary button
         self.open_browser_button = toga.Button(
             "🌐 Open in Browser",
             on_press=self.open_in_browser,
-            style=Pack(
-                padding=12,
-                background_color="#4C5FD5",
-                color="#ffffff",
-                font_size=13,
-                font_weight="bold"
-            )
+            style=_PRIMARY_BUTTON_STYLE
         )
         button_container.add(self.open_browser_button)
         
         # Secondary buttons row
-        secondary_buttons = toga.Box(style=Pack(
-            direction=ROW,
-            padding_top=8,
-            alignment="center"
-        ))
+        secondary_buttons = toga.Box(style=_SECONDARY_ROW_STYLE)
     
         
         button_container.add(secondary_buttons)
         main_box.add(button_container)
         
         # Flexible spacer to push footer down
-        main_box.add(toga.Box(style=Pack(flex=1)))
+        main_box.add(toga.Box(style=_SPACER_STYLE))
         
         # Footer with version info
         version_label = toga.Label(
             "v1.0.0 • Local Processing",
-            style=Pack(
-                font_size=9,
-                color="#adb5bd",
-                text_align="center",
-                padding_bottom=5
-            )
+            style=_FOOTER_STYLE
         )
         main_box.add(version_label)
         
         # Set the main window content
         self.main_window.content = main_box
         self.main_window.show()
+
+    def startup(self):
+        """Initialize the application."""
+        # Ensure icon is set correctly
+        self._set_app_icon()
+        
+        # Find available ports and launch the backend before building any
+        # widgets, so Django's import and setup overlap with UI construction
+        print("🔍 Looking for available ports...")
+        self.backend_port = self.find_free_port(self.backend_ports)
+        backend_started = False
+        if self.backend_port:
+            print(f"✅ Using port - Backend: {self.backend_port}")
+            backend_started = self.start_servers()
+        
+        self._build_ui()
         
         # Store the frontend URL for later use
         self.frontend_url = None
         
-        # Ensure frontend is built before starting servers
+        # Check and build the frontend (npm can take minutes) in parallel
+        # with the backend, which is already starting on its own thread
         print("🔍 Preparing frontend...")
         self.status_label.text = "🔧 Preparing frontend..."
-        
-        # Check and build frontend if needed
-        frontend_ready = self.ensure_frontend_ready()
-        if not frontend_ready:
-            self.status_label.text = "⚠️ Frontend build failed"
-            print("⚠️  Continuing without frontend build - server will still start")
-        
-        # Find available ports
-        print("🔍 Looking for available ports...")
-        self.backend_port = self.find_free_port(self.backend_ports)
+        threading.Thread(target=self._prepare_frontend, daemon=True).start()
         
         if not self.backend_port:
             self.status_label.text = "⚠️ Port Error"
             print("❌ ERROR: Could not determine backend port!")
             return
         
-        print(f"✅ Using port - Backend: {self.backend_port}")
+        if not backend_started:
+            self.status_label.text = "Backend startup failed"
+            return
         
         # Update initial status
         self.status_label.text = "🚀 Starting server..."
-        
-        # Start the backend server
-        self.start_servers()
 
         # Add a background task to check on the servers and auto-open browser
-        import asyncio
         asyncio.create_task(self.poll_servers_until_ready_async())
 
     def check_and_run_migrations(self):
@@ -471,7 +694,7 @@ class WebLLMChatApp(toga.App):
         return True
 
     def start_servers(self):
-        """Start backend server."""
+        """Start backend server. Returns False if the backend thread could not be started."""
         print("\n🚀 Starting Cognitio Chat Framework...")
         
         # Check migrations first (will be skipped in app bundle mode)
@@ -499,10 +722,51 @@ class WebLLMChatApp(toga.App):
             print("✅ Backend thread started")
         except Exception as e:
             print(f"❌ Error starting backend thread: {e}")
-            self.status_label.text = "Backend startup failed"
-            return
+            return False
         
         print("🚀 Server startup initiated successfully")
+        return True
+
+    def _migration_state_digest(self):
+        """Fingerprint the migration files of every installed app plus the database.
+
+        Returns None, so migrate always runs, when the database is not SQLite
+        (a server database can be dropped, recreated or moved to another host
+        under the same settings without any local trace) or when the SQLite
+        file does not exist yet.
+        """
+        from django.apps import apps
+        from django.conf import settings
+        
+        database = settings.DATABASES['default']
+        if 'sqlite3' not in database.get('ENGINE', ''):
+            return None
+        
+        digest = hashlib.blake2b()
+        db_name = str(database.get('NAME', ''))
+        digest.update(f"{database.get('ENGINE')}\0{db_name}\n".encode())
+        try:
+            # The inode changes if the database file is deleted and recreated
+            digest.update(f"{os.stat(db_name).st_ino}\n".encode())
+        except OSError:
+            return None
+        
+        for app_config in apps.get_app_configs():
+            migrations_dir = Path(app_config.path) / 'migrations'
+            try:
+                with os.scandir(migrations_dir) as it:
+                    entries = sorted(
+                        (entry for entry in it if entry.name.endswith('.py')),
+                        key=lambda entry: entry.name,
+                    )
+            except OSError:
+                continue
+            for entry in entries:
+                st = entry.stat()
+                digest.update(
+                    f"{app_config.label}\0{entry.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode()
+                )
+        return digest.hexdigest()
 
     def start_backend(self):
         """Start the Django backend server."""
@@ -522,122 +786,150 @@ class WebLLMChatApp(toga.App):
             for key, value in env_vars.items():
                 os.environ[key] = value
             
-            # Try to start Django programmatically first (works for both modes)
-            print("🚀 Starting Django backend programmatically...")
+            # A separate manage.py process costs a second interpreter start and
+            # Django import; only use it when explicitly asked for in development
+            if os.environ.get('COGNITIO_USE_SUBPROCESS') and not self.app_bundle_mode:
+                if self._start_backend_subprocess(env_vars):
+                    return
+            else:
+                if self._start_backend_programmatic():
+                    return
+
+            # If all else fails, just continue - the UI will still work
+            print("⚠️  Backend startup failed - continuing with UI only")
+            print("ℹ️  You can manually start the backend server if needed")
             
-            try:
-                import django
-                from django.core.management import call_command
-                from django.conf import settings
-                import threading
-                import sys
-                
-                # Increase recursion limit to handle Django initialization
-                original_recursion_limit = sys.getrecursionlimit()
-                sys.setrecursionlimit(3000)  # Increase the recursion limit
-                
-                # Initialize Django without touching settings - we already set up environment variables
-                os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cognitio_app.backend.settings')
-                if not django.conf.settings.configured:
-                    django.setup()
+        except Exception as e:
+            print(f"❌ Error starting backend: {e}")
+            print(f"   Error type: {type(e).__name__}")
+            import traceback
+            print(f"   Traceback: {traceback.format_exc()}")
+            print("ℹ️  Continuing without backend - UI will still load")
 
-                # Run migrations
+    def _start_backend_programmatic(self):
+        """Run migrations and serve Django from a thread in this process."""
+        print("🚀 Starting Django backend programmatically...")
+        
+        try:
+            if django is None:
+                raise ImportError("Django is not installed")
+            
+            # Key off the app registry, not settings.configured: settings can be
+            # loaded well before the models are. While another thread is still
+            # populating, setup() waits on the registry lock instead of racing it
+            if not django.apps.apps.ready:
+                django.setup()
+
+            # Run migrations, unless nothing changed since the last successful run
+            migration_digest = self._migration_state_digest()
+            if migration_digest and migration_digest == _read_cache('migrations.hash'):
+                print("✅ Database migrations up to date - skipping migrate")
+            else:
                 print("🗄️  Running database migrations...")
                 try:
                     call_command('migrate', verbosity=0, interactive=False)
+                    if migration_digest:
+                        _write_cache('migrations.hash', migration_digest)
                     print("✅ Database migrations completed successfully")
                 except Exception as e:
-                        print(f"⚠️  Migration warning (continuing anyway): {e}")
-                
-                # Create a thread to run the server
-                def run_server():
-                    try:
-                        print(f"📡 Django server starting on port {self.backend_port}")
-                        # Reset recursion limit back to original in the new thread
-                        sys.setrecursionlimit(original_recursion_limit)
-                        call_command('runserver', f'127.0.0.1:{self.backend_port}', verbosity=0, use_reloader=False)
-                    except Exception as e:
-                        print(f"⚠️  Django server error: {e}")
-                
-                server_thread = threading.Thread(target=run_server, daemon=True)
-                server_thread.start()
-                
-                print("✅ Django backend started successfully")
-                return
-                
-            except Exception as e:
-                print(f"⚠️  Programmatic Django start failed: {e}")
-                print("ℹ️  Trying fallback approach...")
+                    print(f"⚠️  Migration warning (continuing anyway): {e}")
             
-            # Fallback: Try subprocess approach only in development mode
-            if not self.app_bundle_mode:
-                print("🛠️  Trying subprocess approach (development mode only)...")
-                
+            # Create a thread to run the server
+            def run_server():
                 try:
-                    # Get the project root directory
-                    project_root = Path(__file__).parent.parent.parent
-                    original_cwd = os.getcwd()
-                    os.chdir(project_root)
-                    
-                    # Check if manage.py exists
-                    manage_py_path = project_root / "manage.py"
-                    if manage_py_path.exists():
-                        print(f"📁 Working directory: {project_root}")
-                        
-                        # Create environment for subprocess
-                        env = os.environ.copy()
-                        env.update(env_vars)
-                        
-                        # Start Django server via subprocess
-                        self.backend_process = subprocess.Popen([
-                            sys.executable,
-                            str(manage_py_path), "runserver",
-                            f"127.0.0.1:{self.backend_port}",
-                            "--noreload",
-                            "--insecure"
-                        ], cwd=project_root, env=env)
-                        
-                        print("✅ Django backend started via subprocess")
-                        return
-                    else:
-                        print("⚠️  manage.py not found - skipping subprocess approach")
-                        
+                    print(f"📡 Django server starting on port {self.backend_port}")
+                    call_command('runserver', f'127.0.0.1:{self.backend_port}', verbosity=0, use_reloader=False)
                 except Exception as e:
-                    print(f"⚠️  Subprocess approach failed: {e}")
-                finally:
-                    try:
-                        os.chdir(original_cwd)
-                    except:
-                        pass
+                    print(f"⚠️  Django server error: {e}")
             
-            # If all else fails, just continue - the UI will still work
-            print("⚠️  Backend startup failed - continuing with UI only")
-            print("ℹ️  You can manually start the backend server if needed")
+            server_thread = threading.Thread(target=run_server, daemon=True)
+            server_thread.start()
+            
+            print("✅ Django backend started successfully")
+            self._signal_when_listening(server_thread.is_alive)
+            return True
             
         except Exception as e:
-            print(f"❌ Error starting backend: {e}")
-            print(f"   Error type: {type(e).__name__}")
-            import traceback
-            print(f"   Traceback: {traceback.format_exc()}")
-            print("ℹ️  Continuing without backend - UI will still load")
+            print(f"⚠️  Programmatic Django start failed: {e}")
+        return False
 
-    def check_servers_status(self):
-        """Check server status and update UI (main thread safe)."""
+    def _start_backend_subprocess(self, env_vars):
+        """Start the backend as a separate manage.py runserver process (opt-in)."""
+        print("🛠️  Starting Django backend via subprocess (COGNITIO_USE_SUBPROCESS)...")
+        
         try:
-            import requests
-        except ImportError:
+            # Get the project root directory
+            project_root = _PROJECT_ROOT
+            
+            # Check if manage.py exists
+            manage_py_path = project_root / "manage.py"
+            if manage_py_path.exists():
+                print(f"📁 Working directory: {project_root}")
+                
+                # Create environment for subprocess
+                env = os.environ.copy()
+                env.update(env_vars)
+                
+                # Start Django server via subprocess
+                self.backend_process = subprocess.Popen([
+                    sys.executable,
+                    str(manage_py_path), "runserver",
+                    f"127.0.0.1:{self.backend_port}",
+                    "--noreload",
+                    "--insecure"
+                ], cwd=project_root, env=env)
+                
+                print("✅ Django backend started via subprocess")
+                process = self.backend_process
+                self._signal_when_listening(lambda: process.poll() is None)
+                return True
+            else:
+                print("⚠️  manage.py not found - skipping subprocess approach")
+                
+        except Exception as e:
+            print(f"⚠️  Subprocess approach failed: {e}")
+        return False
+
+    def _signal_when_listening(self, is_alive):
+        """Block until the backend port accepts connections, then set ``backend_ready``.
+
+        Retries with exponential backoff (10ms doubling up to 200ms) and gives
+        up if the server dies or the app is shutting down.
+        """
+        delay = 0.01
+        while not self._stop_event.is_set() and is_alive():
+            try:
+                socket.create_connection(('127.0.0.1', self.backend_port), timeout=0.05).close()
+            except OSError:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.2)
+                continue
+            
+            print(f"✅ Backend is accepting connections on port {self.backend_port}")
+            self.loop.call_soon_threadsafe(self.backend_ready.set)
             return
         
-        backend_ready = False
-        
-        # Check backend
+        print("⚠️  Backend stopped before accepting connections")
+
+    async def _backend_listening_async(self, timeout=0.1):
+        """Return True if the backend port accepts a TCP connection, without blocking the loop."""
         try:
-            backend_url = f"http://127.0.0.1:{self.backend_port}"
-            response = requests.get(f'{backend_url}/', timeout=3)
-            if response.status_code in [200, 404]:  # 404 is ok for Django catch-all
-                backend_ready = True
-        except:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection('127.0.0.1', self.backend_port), timeout
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
             pass
+        return True
+
+    async def check_servers_status(self):
+        """Check server status and update UI (runs on the event loop)."""
+        # A plain TCP connect is enough to tell the local server is up
+        backend_ready = await self._backend_listening_async()
         
         # Update main status and auto-open browser if ready
         if backend_ready:
@@ -655,24 +947,34 @@ class WebLLMChatApp(toga.App):
                 if not self.browser_opened:
                     self.browser_opened = True
                     print(f"🌐 Auto-opening WebLLM Chat in browser: {self.frontend_url}")
-                    webbrowser.open(self.frontend_url)
+                    # Launching the browser can take a while; keep it off the event loop
+                    threading.Thread(target=webbrowser.open_new_tab, args=(self.frontend_url,), daemon=True).start()
             else:
                 self.status_label.text = "⚠️ Backend ready • Frontend missing"
         else:
             self.status_label.text = f"⏳ Starting on :{self.backend_port}..."
 
-    def check_servers_now(self, widget):
+    async def check_servers_now(self, widget):
         """Manual server status check with detailed output."""
         print("\n🔍 Manual server status check...")
         self.status_label.text = "🔍 Checking..."
-        self.check_servers_status()
+        await self.check_servers_status()
         print("✅ Status check complete!")
 
-    def wait_for_process_termination(self, process, name, timeout=10):
-        """Wait for a process to terminate properly."""
+    def wait_for_process_termination(self, process, name, timeout=None):
+        """Terminate a process, escalating to SIGKILL after ``timeout`` seconds.
+
+        ``timeout`` defaults to COGNITIO_SHUTDOWN_TIMEOUT (10s when unset).
+        """
         if process is None:
             return
         
+        if timeout is None:
+            try:
+                timeout = float(os.environ.get('COGNITIO_SHUTDOWN_TIMEOUT', 10))
+            except ValueError:
+                timeout = 10
+        
         try:
             # First try graceful termination
             process.terminate()
@@ -680,36 +982,66 @@ class WebLLMChatApp(toga.App):
             
             # Wait for process to finish
             try:
-                process.wait(timeout=timeout)
+                _wait_process(process, timeout)
                 print(f"✅ {name} terminated gracefully")
             except subprocess.TimeoutExpired:
                 # Force kill if timeout
                 print(f"⚠️  Force killing {name}...")
                 process.kill()
-                process.wait(timeout=5)
+                _wait_process(process, 5)
                 print(f"✅ {name} force killed")
                 
         except Exception as e:
             print(f"❌ Error terminating {name}: {e}")
 
+    def _backend_accepting(self, timeout=0.02):
+        """Return True if something accepts connections on the backend port."""
+        try:
+            socket.create_connection(('127.0.0.1', self.backend_port), timeout=timeout).close()
+            return True
+        except OSError:
+            return False
+
+    def _wait_for_port_release(self, timeout=3.0):
+        """Wait until the backend port refuses connections, up to ``timeout`` seconds."""
+        deadline = time.monotonic() + timeout
+        while self._backend_accepting():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.02)
+        return True
+
     def restart_servers(self, widget):
         """Restart the backend server."""
         print("\n🔄 Restarting WebLLM Chat server...")
         self.status_label.text = "🔄 Restarting..."
         
-        # Properly terminate existing processes
+        # Properly terminate existing processes, then wait until the port is
+        # actually released rather than sleeping for a fixed time
         if self.backend_process:
             self.wait_for_process_termination(self.backend_process, "Backend")
             self.backend_process = None
+            self._wait_for_port_release()
         
         # Reset browser opened flag so it opens again
         self.browser_opened = False
         self.frontend_url = None
+        self.backend_ready.clear()
+        self._frontend_built_cache = None
         
-        time.sleep(2)
+        # The in-process runserver thread cannot be stopped; if it is still
+        # serving, reuse it instead of starting a second one on the same port
+        if self._backend_accepting():
+            print(f"ℹ️  Backend still serving on port {self.backend_port} - reusing it")
+            self.backend_ready.set()
+            asyncio.create_task(self.poll_servers_until_ready_async())
+            return
         
         # Start servers again
-        self.start_servers()
+        if not self.start_servers():
+            self.status_label.text = "Backend startup failed"
+            return
+        asyncio.create_task(self.poll_servers_until_ready_async())
         print("✅ Restart initiated!")
 
     def open_in_browser(self, widget):
@@ -730,7 +1062,7 @@ class WebLLMChatApp(toga.App):
                 return
                 
             print(f"🌐 Opening in browser: {self.frontend_url}")
-            webbrowser.open(self.frontend_url)
+            threading.Thread(target=webbrowser.open_new_tab, args=(self.frontend_url,), daemon=True).start()
         else:
             print("⚠️  Frontend URL not available yet")
             self.status_label.text = "⚠️ Not ready yet..."
@@ -772,53 +1104,45 @@ class WebLLMChatApp(toga.App):
         return True
 
     async def poll_servers_until_ready_async(self):
-        """Polls servers until they are ready, then stops."""
-        import asyncio
-        
-        # Give servers a moment to start up before the first check
-        await asyncio.sleep(3.0)
-
-        while not self.frontend_url and not self._stop_event.is_set():
-            self.check_servers_status()
-            await asyncio.sleep(2)  # Wait for 2 seconds before checking again
+        """Waits for the backend and the frontend build, then updates the UI once."""
+        # backend_ready is never set if the server dies while starting, so
+        # bound that wait; frontend_prepared is always set, even on failure
+        try:
+            await asyncio.wait_for(self.backend_ready.wait(), timeout=_BACKEND_READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"⚠️ Backend did not accept connections within {_BACKEND_READY_TIMEOUT}s")
+            await self.check_servers_status()
+            return
+        await self.frontend_prepared.wait()
+        if self._stop_event.is_set():
+            return
+        await self.check_servers_status()
         
         if self.frontend_url:
             print("✅ WebLLM Chat is ready. Polling task finished.")
         else:
-            print("⚠️ Polling stopped before server was ready.")
+            print("⚠️ Backend is listening but did not answer the status check.")
+
+
+_BANNER = "\n".join([
+    "🤖 Starting WebLLM Chat Desktop Application...",
+    "💻 Debug information will be displayed in this terminal",
+    "🌐 Application will open in your default browser for WebGPU support",
+    "🔧 Use the control panel to manage the server",
+    "🧠 All AI processing happens locally with WebLLM",
+    "-" * 60,
+]) + "\n"
 
 
 def main():
     """Main entry point for the application."""
-    # Create a simple placeholder icon if none exists
-    icon_base = Path(__file__).parent / "resources"
+    _load_env()
     
-    # Ensure resources directory exists
-    icon_base.mkdir(exist_ok=True)
-    
-    # Try different icon formats in order of preference for macOS
-    icon_paths = [
-        icon_base / "LOGO-light-vertical.icns",  # macOS native format
-        icon_base / "LOGO-light-vertical.png",   # Fallback PNG
-        icon_base / "LOGO-light-vertical.ico",   # Windows format as last resort
-    ]
-    
-    icon_path = None
-    for path in icon_paths:
-        if path.exists():
-            icon_path = str(path)
-            print(f"📱 Using icon: {icon_path}")
-            break
-    
-    if not icon_path:
+    icon_path = str(_ICON_PATH) if _ICON_PATH else None
+    if icon_path:
+        print(f"📱 Using icon: {icon_path}")
+    else:
         print("ℹ️  No icon file found, using default")
-        # Create a simple placeholder icon if none exists
-        try:
-            # For development, just use None to let Toga use default
-            icon_path = None
-        except Exception as e:
-            print(f"ℹ️  Icon creation note: {e}")
-            icon_path = None
     
     return WebLLMChatApp(
         'WebLLM Chat',
@@ -829,12 +1153,8 @@ def main():
 
 
 if __name__ == '__main__':
-    print("🤖 Starting WebLLM Chat Desktop Application...")
-    print("💻 Debug information will be displayed in this terminal")
-    print("🌐 Application will open in your default browser for WebGPU support")
-    print("🔧 Use the control panel to manage the server")
-    print("🧠 All AI processing happens locally with WebLLM")
-    print("-" * 60)
+    sys.stdout.write(_BANNER)
+    sys.stdout.flush()
     
     app = main()
     app.main_loop()
\ No newline at end of file
@@ -40,6 +40,12 @@ class Command(BaseCommand):
         )
 
         mode = options['mode']
+        self.verbosity = options['verbosity']
+
+        # Directory layout, resolved once for all steps; BASE_DIR is the
+        # cognitio_app package directory
+        self.base_dir = Path(settings.BASE_DIR)
+        self.frontend_dir = self.base_dir / 'backend' / 'frontend-src'
         skip_frontend = options['skip_frontend']
         create_env = options['create_env']
 
@@ -66,9 +72,8 @@ class Command(BaseCommand):
 
     def create_env_file(self):
         """Create .env file from .env.example if it doesn't exist"""
-        base_dir = Path(settings.BASE_DIR)
-        env_file = base_dir / '.env'
-        env_example_file = base_dir / '.env.example'
+        env_file = self.base_dir / '.env'
+        env_example_file = self.base_dir / '.env.example'
 
         if env_file.exists():
             self.stdout.write(
@@ -143,8 +148,7 @@ class Command(BaseCommand):
         """Set up the frontend"""
         self.stdout.write('🎨 Setting up frontend...')
         
-        base_dir = Path(settings.BASE_DIR)
-        frontend_dir = base_dir / 'src' / 'cognitio_app' / 'backend' / 'frontend-src'
+        frontend_dir = self.frontend_dir
         
         if not frontend_dir.exists():
             self.stdout.write(
@@ -152,6 +156,13 @@ class Command(BaseCommand):
             )
             return
 
+        # npm progress output can run to megabytes; only show it at -v 2+ and
+        # otherwise discard it, keeping stderr for the error report
+        npm_output = {
+            'stdout': None if self.verbosity >= 2 else subprocess.DEVNULL,
+            'stderr': None if self.verbosity >= 2 else subprocess.PIPE,
+        }
+
         try:
             # Check if node_modules exists
             node_modules = frontend_dir / 'node_modules'
@@ -161,7 +172,7 @@ class Command(BaseCommand):
                     ['npm', 'install'],
                     cwd=frontend_dir,
                     check=True,
-                    capture_output=True
+                    **npm_output
                 )
                 self.stdout.write(
                     self.style.SUCCESS('✅ NPM dependencies installed')
@@ -174,7 +185,7 @@ class Command(BaseCommand):
                 ['npm', 'run', build_command],
                 cwd=frontend_dir,
                 check=True,
-                capture_output=True
+                **npm_output
             )
             
             self.stdout.write(
@@ -185,6 +196,8 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f'❌ Frontend setup failed: {e}')
             )
+            if e.stderr:
+                self.stdout.write(e.stderr.decode(errors='replace'))
             self.stdout.write(
                 self.style.WARNING('You may need to install Node.js and npm')
             )
@@ -199,18 +212,25 @@ class Command(BaseCommand):
         
         from django.contrib.auth.models import User
         
-        if User.objects.filter(username='admin').exists():
-            self.stdout.write(
-                self.style.WARNING('⚠️  Admin user already exists')
-            )
-            return
-
         try:
-            User.objects.create_superuser(
+            # get_or_create retries the lookup on IntegrityError, so a parallel
+            # setup run that inserts the user first is not an error
+            user, created = User.objects.get_or_create(
                 username='admin',
-                email='admin@example.com',
-                password='admin123'
+                defaults={
+                    'email': 'admin@example.com',
+                    'is_staff': True,
+                    'is_superuser': True,
+                }
             )
+            if not created:
+                self.stdout.write(
+                    self.style.WARNING('⚠️  Admin user already exists')
+                )
+                return
+            
+            user.set_password('admin123')
+            user.save(update_fields=['password'])
             
             self.stdout.write(
                 self.style.SUCCESS('✅ Created admin user (admin/admin123)')
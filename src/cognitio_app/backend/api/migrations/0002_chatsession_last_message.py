@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-15 03:32
+
+from django.db import migrations, models
+
+
+def backfill_last_message(apps, schema_editor):
+    """Populate the denormalized message fields for existing sessions."""
+    ChatSession = apps.get_model('api', 'ChatSession')
+    ChatMessage = apps.get_model('api', 'ChatMessage')
+    for session in ChatSession.objects.all().iterator():
+        messages = ChatMessage.objects.filter(session_id=session.pk)
+        last = messages.order_by('-created_at').values('content', 'created_at').first()
+        if last is None:
+            continue
+        content = last['content']
+        ChatSession.objects.filter(pk=session.pk).update(
+            last_message_preview=content[:100] + "..." if len(content) > 100 else content,
+            last_message_at=last['created_at'],
+            message_count=messages.count(),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatsession',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the most recent message was sent', null=True),
+        ),
+        migrations.AddField(
+            model_name='chatsession',
+            name='last_message_preview',
+            field=models.CharField(blank=True, help_text='Preview of the most recent message', max_length=103),
+        ),
+        migrations.RunPython(backfill_last_message, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-15 03:34
+
+import cognitio_app.backend.api.models.base
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_chatsession_last_message'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chatmessage',
+            name='id',
+            field=models.UUIDField(default=cognitio_app.backend.api.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='chatsession',
+            name='id',
+            field=models.UUIDField(default=cognitio_app.backend.api.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='errorlog',
+            name='id',
+            field=models.UUIDField(default=cognitio_app.backend.api.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='usersession',
+            name='id',
+            field=models.UUIDField(default=cognitio_app.backend.api.models.base.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='usersession',
+            name='api_userses_session_8397e3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='usersession',
+            name='api_userses_session_07c949_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='usersession',
+            name='api_userses_is_acti_8a7df0_idx',
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['is_active_session', 'last_activity'], name='usersess_active_lastact_idx'),
+        ),
+    ]
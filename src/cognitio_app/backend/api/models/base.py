@@ -2,6 +2,8 @@
 This module contains the base model classes that are inherited by other models.
 """
 
+import os
+import time
 import uuid
 from django.db import models
 from django.contrib.auth import get_user_model
@@ -9,6 +11,19 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+    
+    The leading 48 bits are the Unix time in milliseconds, so new keys land at
+    the right-hand edge of the primary key index instead of a random page.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 class TimeStampedModel(models.Model):
     """
     Abstract base class that provides self-updating 'created_at' and 'updated_at' fields.
@@ -24,7 +39,7 @@ class UUIDModel(TimeStampedModel):
     """
     Abstract base class with UUID primary key and timestamps.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     
     class Meta:
         abstract = True
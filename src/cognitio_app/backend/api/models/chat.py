@@ -4,7 +4,9 @@ This module contains models related to chat sessions, messages, query executions
 
 import uuid
 from typing import Dict, Any, Optional
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Now
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -26,6 +28,10 @@ class ChatSession(UUIDModel):
     is_active = models.BooleanField(default=True, help_text="Whether this session is currently active")
     message_count = models.IntegerField(default=0, help_text="Total number of messages in this session")
     
+    # Denormalized from the newest message so session lists need no per-row query
+    last_message_preview = models.CharField(max_length=103, blank=True, help_text="Preview of the most recent message")
+    last_message_at = models.DateTimeField(null=True, blank=True, db_index=True, help_text="When the most recent message was sent")
+    
     system_prompt = models.TextField(
         blank=True, 
         help_text="Custom system prompt for this session"
@@ -45,11 +51,25 @@ class ChatSession(UUIDModel):
     
     def get_last_message_preview(self) -> str:
         """Get a preview of the last message in this session."""
-        last_message = self.messages.order_by('-created_at').first()
-        if last_message:
-            content = last_message.content[:100]
-            return content + "..." if len(last_message.content) > 100 else content
-        return "No messages yet"
+        return self.last_message_preview or "No messages yet"
+    
+    @classmethod
+    def increment_message_count(cls, session_id, delta: int = 1, **fields) -> int:
+        """Atomically add ``delta`` to a session's message count, setting any extra ``fields``.
+
+        Also bumps ``updated_at`` so the session moves to the top of the list.
+        Returns the number of rows updated.
+        """
+        return cls.objects.filter(pk=session_id).update(
+            message_count=F('message_count') + delta,
+            updated_at=Now(),
+            **fields,
+        )
+
+
+def message_preview(content: str) -> str:
+    """Truncate message content to the preview stored on ChatSession."""
+    return content[:100] + "..." if len(content) > 100 else content
 
 
 class ChatMessage(UUIDModel):
@@ -93,4 +113,37 @@ class ChatMessage(UUIDModel):
         ]
     
     def __str__(self):
-        return f"{self.get_message_type_display()} in {self.session.title}"
\ No newline at end of file
+        return f"{self.get_message_type_display()} in {self.session.title}"
+    
+    def save(self, *args, **kwargs):
+        created = self._state.adding
+        super().save(*args, **kwargs)
+        if created:
+            # Single UPDATE keeps the session's denormalized fields in step
+            ChatSession.increment_message_count(
+                self.session_id,
+                last_message_preview=message_preview(self.content),
+                last_message_at=self.created_at,
+            )
+
+    @classmethod
+    def bulk_create_for_session(cls, session_id, messages: list) -> list:
+        """Insert unsaved messages for one session with a single INSERT.
+
+        bulk_create() bypasses save(), so the session's count and preview are
+        updated here in the same transaction.
+        """
+        if not messages:
+            return []
+        for message in messages:
+            message.session_id = session_id
+        with transaction.atomic():
+            created = cls.objects.bulk_create(messages)
+            last = created[-1]
+            ChatSession.increment_message_count(
+                session_id,
+                delta=len(created),
+                last_message_preview=message_preview(last.content),
+                last_message_at=last.created_at,
+            )
+        return created
@@ -96,4 +96,5 @@ class ErrorLog(UUIDModel):
         self.resolved_at = timezone.now()
         self.resolved_by = resolved_by
         self.resolution_notes = notes
-        self.save()
\ No newline at end of file
+        # Leave the stack trace and JSON payloads alone; they can be large
+        self.save(update_fields=['is_resolved', 'resolved_at', 'resolved_by', 'resolution_notes', 'updated_at'])
@@ -117,9 +117,8 @@ class UserSession(UUIDModel):
         ordering = ['-session_start']
         indexes = [
             models.Index(fields=['user', '-session_start']),
-            models.Index(fields=['session_id']),
-            models.Index(fields=['is_active_session']),
-            models.Index(fields=['session_start']),
+            # Expiring idle sessions: range scan over active sessions by last activity
+            models.Index(fields=['is_active_session', 'last_activity'], name='usersess_active_lastact_idx'),
             models.Index(fields=['device_type']),
             models.Index(fields=['country']),
             models.Index(fields=['is_bounce']),
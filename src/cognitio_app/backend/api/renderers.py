@@ -0,0 +1,38 @@
+"""
+Custom renderers for API responses.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson when it is installed.
+    
+    Types orjson does not know (Decimal, lazy strings, querysets, ...) go through
+    DRF's encoder. Indented output, as requested by the browsable API or an
+    ``indent`` media type parameter, is left to the stock renderer, and so is
+    anything orjson rejects outright (such as integers beyond 64 bits).
+    """
+    
+    _fallback_default = JSONEncoder().default
+    
+    # Non-str dict keys are stringified, as the stdlib encoder does
+    _options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return orjson.dumps(data, default=self._fallback_default, option=self._options)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
@@ -4,29 +4,290 @@ Authentication service for handling user authentication with backend API.
 Contains business logic for login, signup, logout, and session management.
 """
 
+import base64
+import functools
+import hashlib
+import json
 import logging
+import threading
+import time
 from typing import Dict, Any, Optional, Tuple
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.conf import settings
+import jwt
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Successful token validations and refreshes, keyed by a hash of the token
+# (never the raw token) and kept for at most _TOKEN_CACHE_MAX_TTL seconds or
+# until the token expires, whichever is sooner. Set CACHE_JWT_VALIDATION =
+# False in settings to always ask the cloud API.
+_TOKEN_CACHE_MAX_TTL = 60
+_TOKEN_CACHE_DEFAULT_TTL = 30
+_TOKEN_CACHE_MAX_SIZE = 10000
+_token_cache: Dict[str, Tuple[float, Any]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(token: str, kind: str = 'validate') -> str:
+    """Cache key for a token: the cached operation plus a truncated SHA-256 digest."""
+    return f"{kind}:{hashlib.sha256(token.encode()).hexdigest()[:32]}"
+
+
+def _token_exp(token: str) -> Optional[float]:
+    """The unverified ``exp`` claim of a JWT, or None if it has none or is not a JWT."""
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _token_ttl(token: str) -> float:
+    """Seconds a result for ``token`` may be cached, based on its ``exp`` claim."""
+    exp = _token_exp(token)
+    if exp is None:
+        return _TOKEN_CACHE_DEFAULT_TTL
+    return max(0.0, min(exp - time.time(), _TOKEN_CACHE_MAX_TTL))
+
+
+# Allowance for clock skew with the cloud API before a token is treated as expired
+_TOKEN_EXPIRY_LEEWAY = 30
+
+
+def _token_expired(token: str) -> bool:
+    """
+    Whether ``token`` has certainly expired, judged from its unverified ``exp``.
+    
+    Only ever used to reject early: a token that is not a JWT or carries no
+    ``exp`` is left for the cloud API to judge.
+    """
+    exp = _token_exp(token)
+    return exp is not None and exp + _TOKEN_EXPIRY_LEEWAY < time.time()
+
+
+def _token_cache_enabled() -> bool:
+    return getattr(settings, 'CACHE_JWT_VALIDATION', True)
+
+
+def _get_cached_token_result(key: str) -> Optional[Any]:
+    """Return the cached result for a token key, or None if absent or expired."""
+    if not _token_cache_enabled():
+        return None
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del _token_cache[key]
+            return None
+        return result
+
+
+def _cache_token_result(key: str, result: Any, ttl: float) -> None:
+    """Remember a successful result for ``ttl`` seconds."""
+    if ttl <= 0 or not _token_cache_enabled():
+        return
+    now = time.monotonic()
+    with _token_cache_lock:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX_SIZE:
+            # Drop expired entries first, then the oldest if still full
+            for stale in [k for k, (exp, _) in _token_cache.items() if exp <= now]:
+                del _token_cache[stale]
+            if len(_token_cache) >= _TOKEN_CACHE_MAX_SIZE:
+                del _token_cache[next(iter(_token_cache))]
+        _token_cache[key] = (now + ttl, result)
+
+
+def _forget_token_result(key: str) -> None:
+    with _token_cache_lock:
+        _token_cache.pop(key, None)
+
+
+_ENV_KEY_TRANS = str.maketrans({'@': '_', '.': '_'})
+
+
+@functools.lru_cache(maxsize=1024)
+def _password_env_key(email: str) -> str:
+    """Environment variable name holding the stored password for ``email``."""
+    return f"USER_PASSWORD_{email.translate(_ENV_KEY_TRANS).upper()}"
+
+
+# Standard headers for API requests, set once on the shared session
+_DEFAULT_HEADERS = {
+    'Content-Type': 'application/json',
+    'User-Agent': 'Cognitio-Desktop-App/1.0'
+}
+
+
+def _json_body(response: requests.Response) -> Any:
+    """Decode a JSON response body straight from bytes, with orjson if installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+# Response keys the API has used for tokens, in order of preference
+_ACCESS_TOKEN_KEYS = ('access_token', 'token', 'access')
+_REFRESHED_ACCESS_TOKEN_KEYS = ('access', 'access_token', 'token')
+_REFRESH_TOKEN_KEYS = ('refresh_token', 'refresh')
+
+
+def _first_value(data: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """Return the first truthy value of ``keys`` in ``data``, or None."""
+    return next((value for value in map(data.get, keys) if value), None)
+
+
+# Upper bounds, in seconds, on a single backoff sleep and on an honored
+# Retry-After; the retries run on the Django request thread
+_RETRY_BACKOFF_MAX = 5
+_RETRY_AFTER_MAX = 10
+
+
+class _CloudRetry(Retry):
+    """Retry that only replays a POST when the server says it was not processed.
+    
+    POST is left out of ``allowed_methods``, so read timeouts and dropped
+    responses are never replayed: login, logout and token refresh may already
+    have taken effect (a replayed refresh can rotate away the token just
+    issued). Connection failures are still retried, and so are 429/503
+    responses that carry Retry-After.
+    """
+    
+    # urllib3 1.26 has no backoff_max argument and reads this attribute instead
+    DEFAULT_BACKOFF_MAX = _RETRY_BACKOFF_MAX
+    
+    def get_retry_after(self, response):
+        # Capped here rather than with retry_after_max, which only recent
+        # urllib3 releases accept
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, _RETRY_AFTER_MAX)
+    
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method and method.upper() == 'POST':
+            return bool(self.total) and has_retry_after and status_code in (429, 503)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _retry_policy() -> Retry:
+    """Retry policy for cloud API calls.
+    
+    Retries connection failures and responses that mean "not processed, try
+    later" (429, 502-504) with exponential backoff and jitter, honoring
+    Retry-After. A plain 500 is not retried: the request may have taken effect.
+    See _CloudRetry for the narrower rules applied to POST.
+    """
+    options = dict(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({'GET'}),
+        respect_retry_after_header=True,
+        # Hand the final response back so callers see the status code
+        raise_on_status=False,
+    )
+    try:
+        # urllib3 2.x: jitter and an explicit backoff cap
+        return _CloudRetry(backoff_jitter=0.5, backoff_max=_RETRY_BACKOFF_MAX, **options)
+    except TypeError:
+        return _CloudRetry(**options)
+
+
+class _AdaptiveRateLimiter:
+    """Token bucket whose refill rate adapts to 429s (AIMD).
+    
+    A 429 halves the rate; every other successful response adds one request
+    per second back, up to the configured maximum.
+    """
+    
+    def __init__(self, rate: float = 20.0, min_rate: float = 1.0):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def record(self, status_code: int) -> None:
+        """Adapt the rate to a response status."""
+        with self._lock:
+            if status_code == 429:
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif status_code < 400:
+                self.rate = min(self.max_rate, self.rate + 1)
+
+
+_rate_limiter = _AdaptiveRateLimiter()
+
+
+class _RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that paces requests through the shared rate limiter."""
+    
+    def send(self, request, **kwargs):
+        _rate_limiter.acquire()
+        response = super().send(request, **kwargs)
+        _rate_limiter.record(response.status_code)
+        return response
+
 
 class CloudAPIService:
     """Service for communicating with the cloud API."""
     
+    # One HTTP session shared by all instances, so urllib3 keeps connections
+    # to the API alive between calls instead of reconnecting every time
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+    
     def __init__(self):
-        self.base_url =  '127.0.0.1:3927'
+        self.base_url = 'http://127.0.0.1:3927'
+        # Endpoint URLs, built once rather than formatted on every call
+        self._url_login = f'{self.base_url}/auth/login/'
+        self._url_signup = f'{self.base_url}/auth/register/'
+        self._url_validate = f'{self.base_url}/auth/validate-token/'
+        self._url_refresh = f'{self.base_url}/auth/refresh/'
+        self._url_logout = f'{self.base_url}/auth/logout/'
+        self._session = self._get_session()
         logger.info(f"Using cloud API: {self.base_url}")
     
-    def _get_headers(self) -> Dict[str, str]:
-        """Get standard headers for API requests."""
-        return {
-            'Content-Type': 'application/json',
-            'User-Agent': 'Cognitio-Desktop-App/1.0'
-        }
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """Get the shared HTTP session, creating it on first use."""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.headers.update(_DEFAULT_HEADERS)
+                    adapter = _RateLimitedAdapter(pool_connections=10, pool_maxsize=20, max_retries=_retry_policy())
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    cls._session = session
+        return cls._session
 
     def login(self, email: str, password: str) -> Tuple[bool, Optional[str], Optional[str], Optional[Dict[str, Any]]]:
         """
@@ -40,20 +301,19 @@ class CloudAPIService:
             Tuple of (success, access_token, refresh_token, user_data)
         """
         try:
-            response = requests.post(
-                f'{self.base_url}/auth/login/',
+            response = self._session.post(
+                self._url_login,
                 json={
                     'email': email,
                     'password': password
                 },
-                headers=self._get_headers(),
                 timeout=30
             )
             
             if response.status_code == 200:
-                data = response.json()
-                access_token = data.get('access_token') or data.get('token') or data.get('access')
-                refresh_token = data.get('refresh_token') or data.get('refresh')
+                data = _json_body(response)
+                access_token = _first_value(data, _ACCESS_TOKEN_KEYS)
+                refresh_token = _first_value(data, _REFRESH_TOKEN_KEYS)
                 user_data = data.get('user', {})
                 
                 if access_token:
@@ -86,15 +346,14 @@ class CloudAPIService:
             Tuple of (success, message)
         """
         try:
-            response = requests.post(
-                f'{self.base_url}/auth/register/',
+            response = self._session.post(
+                self._url_signup,
                 json={
                     'email': email,
                     'password': password,
                     'first_name': first_name,
                     'last_name': last_name
                 },
-                headers=self._get_headers(),
                 timeout=30
             )
             
@@ -102,7 +361,7 @@ class CloudAPIService:
                 logger.info(f"Successfully created user: {email}")
                 return True, "User created successfully"
             else:
-                error_msg = response.json().get('error', 'Unknown error')
+                error_msg = _json_body(response).get('error', 'Unknown error')
                 logger.error(f"Signup failed: {error_msg}")
                 return False, error_msg
                 
@@ -120,18 +379,22 @@ class CloudAPIService:
         Returns:
             Tuple of (valid, user_data)
         """
+        cache_key = _token_cache_key(token)
+        cached = _get_cached_token_result(cache_key)
+        if cached is not None:
+            return True, cached
+        
         try:
-            response = requests.get(
-                f'{self.base_url}/auth/validate-token/',
-                headers={
-                    **self._get_headers(),
-                    'Authorization': f'Bearer {token}'
-                },
+            response = self._session.get(
+                self._url_validate,
+                headers={'Authorization': f'Bearer {token}'},
                 timeout=30
             )
             
             if response.status_code == 200:
-                user_data = response.json()
+                user_data = _json_body(response)
+                # Only successes are cached; a rejected token is re-checked every time
+                _cache_token_result(cache_key, user_data, _token_ttl(token))
                 return True, user_data
             else:
                 logger.error(f"Token validation failed: {response.status_code}")
@@ -151,19 +414,31 @@ class CloudAPIService:
         Returns:
             Tuple of (success, new_access_token)
         """
+        # Clients often fire several refreshes at once (one per open tab or
+        # pending request); answer the repeats with the token just issued
+        cache_key = _token_cache_key(refresh_token, 'refresh')
+        cached = _get_cached_token_result(cache_key)
+        if cached is not None:
+            return True, cached
+        
+        # An expired refresh token is refused upstream anyway; skip the round trip
+        if _token_expired(refresh_token):
+            logger.info("Refresh token has expired; not contacting cloud API")
+            return False, None
+        
         try:
-            response = requests.post(
-                f'{self.base_url}/auth/refresh/',
+            response = self._session.post(
+                self._url_refresh,
                 json={'refresh': refresh_token},
-                headers=self._get_headers(),
                 timeout=30
             )
             
             if response.status_code == 200:
-                data = response.json()
-                new_access_token = data.get('access') or data.get('access_token') or data.get('token')
+                data = _json_body(response)
+                new_access_token = _first_value(data, _REFRESHED_ACCESS_TOKEN_KEYS)
                 if new_access_token:
                     logger.info("Successfully refreshed access token")
+                    _cache_token_result(cache_key, new_access_token, _token_ttl(new_access_token))
                     return True, new_access_token
                 else:
                     logger.error("No access token in refresh response")
@@ -186,11 +461,11 @@ class CloudAPIService:
         Returns:
             Success status
         """
+        _forget_token_result(_token_cache_key(refresh_token, 'refresh'))
         try:
-            response = requests.post(
-                f'{self.base_url}/auth/logout/',
+            response = self._session.post(
+                self._url_logout,
                 json={'refresh': refresh_token},
-                headers=self._get_headers(),
                 timeout=30
             )
             
@@ -211,30 +486,21 @@ class CloudAPIService:
             JWT token string or None if failed
         """
         try:
-            # For now, we'll create a simple token based on user data
-            # In a production system, you would obtain this from the cloud API
-            # or use a proper JWT library to generate tokens
-            from django.contrib.auth.models import User
-            from django.utils import timezone
-            import base64
-            import json
-            
+            # Signed locally with the Django secret key; in a production system
+            # you would obtain this from the cloud API
             if not isinstance(user, User):
                 logger.warning(f"Invalid user object: {type(user)}")
                 return None
             
-            # Create a simple JWT payload
+            issued_at = int(time.time())
             payload = {
                 'user_id': user.id,
                 'email': user.email,
-                'exp': int((timezone.now() + timezone.timedelta(hours=1)).timestamp()),
-                'iat': int(timezone.now().timestamp()),
+                'exp': issued_at + 3600,
+                'iat': issued_at,
                 'iss': 'cognitio-backend'
             }
-            
-            # For development, we'll use a simple base64 encoding
-            # In production, use proper JWT signing
-            token_data = base64.b64encode(json.dumps(payload).encode()).decode()
+            token_data = jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
             
             logger.info(f"Generated JWT token for user {user.email} (ID: {user.id})")
             return f"Bearer {token_data}"
@@ -256,7 +522,7 @@ class CloudAPIService:
         """
         try:
             # Create a unique key for this user
-            env_key = f"USER_PASSWORD_{user.email.replace('@', '_').replace('.', '_').upper()}"
+            env_key = _password_env_key(user.email)
             
             # Get from environment variable
             import os
@@ -292,7 +558,7 @@ class CloudAPIService:
             import os
             
             # Create a unique key for this user
-            env_key = f"USER_PASSWORD_{email.replace('@', '_').replace('.', '_').upper()}"
+            env_key = _password_env_key(email)
             
             # Set the environment variable
             os.environ[env_key] = password
@@ -511,9 +777,11 @@ class AuthService:
             Dict containing authentication status and user data
         """
         try:
+            user = getattr(request, 'user', None)
+            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+            
             # Check if user is authenticated via Django session
-            if hasattr(request, 'user') and request.user.is_authenticated:
-                user = request.user
+            if user is not None and user.is_authenticated:
                 logger.info(f"User authenticated via Django session: {user.email}")
                 
                 return {
@@ -531,9 +799,8 @@ class AuthService:
                 }
             
             # Check for JWT token in Authorization header
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
             if auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
+                token = auth_header[7:]  # len('Bearer ')
                 
                 # Validate token with cloud API
                 result = self.validate_user_token(token)
@@ -1,3 +1,6 @@
+from collections.abc import Mapping
+
+
 def format_api_response(success, message=None, data=None, errors=None):
     """
     Format API response in a consistent structure.
@@ -30,5 +33,12 @@ def validate_required_fields(data, required_fields):
     Returns:
         dict: A dictionary containing any missing fields.
     """
+    # A JSON list or scalar body has none of the fields
+    if not isinstance(data, Mapping):
+        return {'missing_fields': list(required_fields)}
+    # Common case: everything present, answered by one C-level subset check.
+    # Only on failure build the missing list, in the caller's field order.
+    if data.keys() >= set(required_fields):
+        return {}
     missing_fields = [field for field in required_fields if field not in data]
-    return {'missing_fields': missing_fields} if missing_fields else {}
\ No newline at end of file
+    return {'missing_fields': missing_fields}
\ No newline at end of file
@@ -5,8 +5,12 @@ These views handle HTTP requests and delegate business logic to the AuthService.
 """
 
 import logging
+from django.core.cache import cache
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
-from rest_framework.decorators import api_view, permission_classes
+from django.views.decorators.vary import vary_on_headers
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.authentication import BaseAuthentication
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
@@ -19,6 +23,38 @@ logger = logging.getLogger(__name__)
 # Initialize auth service
 auth_service = AuthService()
 
+# Fixed response bodies, built once; Response() does not mutate its data
+_MISSING_CREDENTIALS_BODY = format_api_response(False, message='Email and password are required')
+_INVALID_CREDENTIALS_BODY = format_api_response(False, message='Invalid email or password')
+_CSRF_COOKIE_SET_BODY = format_api_response(True, message='CSRF token set in cookie')
+_MISSING_REFRESH_TOKEN_BODY = format_api_response(False, message='Refresh token is required')
+_INVALID_REFRESH_TOKEN_BODY = format_api_response(False, message='Invalid refresh token')
+
+# The frontend polls auth_status; session-authenticated answers are reused
+# for a few seconds. Login and logout rotate the session key, so neither
+# is served a stale status.
+AUTH_STATUS_CACHE_TTL = 5
+
+
+def _auth_status_cache_key(request):
+    """Cache key for the caller's auth status, or None if it must not be cached."""
+    if request.META.get('HTTP_AUTHORIZATION'):
+        return None
+    session_key = request.session.session_key
+    return f'authstatus:{session_key}' if session_key else None
+
+
+class _LazySessionAuthentication(BaseAuthentication):
+    """
+    Hand DRF the Django session user without loading it.
+    
+    SessionAuthentication resolves the user (a session and a user query) before
+    the view runs; auth_status only needs it on a cache miss.
+    """
+    
+    def authenticate(self, request):
+        return request._request.user, None
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -35,12 +71,11 @@ def login_with_cloud_api(request):
         
         if not email or not password:
             return Response(
-                format_api_response(False, message='Email and password are required'),
+                _MISSING_CREDENTIALS_BODY,
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        auth_service = AuthService()
-        success, access_token, refresh_token, user_data = auth_service.login(email, password)
+        success, access_token, refresh_token, user_data = auth_service.cloud_api.login(email, password)
         
         if success:
             response_data = {
@@ -60,12 +95,12 @@ def login_with_cloud_api(request):
             )
         else:
             return Response(
-                format_api_response(False, message='Invalid email or password'),
+                _INVALID_CREDENTIALS_BODY,
                 status=status.HTTP_401_UNAUTHORIZED
             )
             
     except Exception as e:
-        logger.error(f"Login failed: {e}")
+        logger.error("Login failed: %s", e)
         return Response(
             format_api_response(False, message=f'Login failed: {str(e)}'),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -107,7 +142,7 @@ def signup_with_cloud_api(request):
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
             
     except Exception as e:
-        logger.error(f"Signup view error: {e}")
+        logger.error("Signup view error: %s", e)
         return Response(
             format_api_response(False, message='Signup failed', errors={'detail': str(e)}),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -124,6 +159,10 @@ def logout_user(request):
         JSON response with logout status
     """
     try:
+        session_key = request.session.session_key
+        if session_key:
+            cache.delete(f'authstatus:{session_key}')
+        
         # Use auth service to handle logout
         success, response_data = auth_service.logout_user(request)
         
@@ -133,15 +172,18 @@ def logout_user(request):
             return Response(response_data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
     except Exception as e:
-        logger.error(f"Logout view error: {e}")
+        logger.error("Logout view error: %s", e)
         return Response(
             format_api_response(False, message='Logout failed', errors={'detail': str(e)}),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
+@cache_control(private=True, max_age=AUTH_STATUS_CACHE_TTL)
+@vary_on_headers('Cookie', 'Authorization')
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@authentication_classes([_LazySessionAuthentication])
 def auth_status(request):
     """
     Check authentication status using Django session.
@@ -150,12 +192,17 @@ def auth_status(request):
         JSON response with authentication status and user data
     """
     try:
-        # Use auth service to get status
-        response_data = auth_service.get_auth_status(request)
+        cache_key = _auth_status_cache_key(request)
+        response_data = cache.get(cache_key) if cache_key else None
+        if response_data is None:
+            # Use auth service to get status
+            response_data = auth_service.get_auth_status(request)
+            if cache_key and response_data.get('success'):
+                cache.set(cache_key, response_data, AUTH_STATUS_CACHE_TTL)
         return Response(response_data, status=status.HTTP_200_OK)
         
     except Exception as e:
-        logger.error(f"Auth status view error: {e}")
+        logger.error("Auth status view error: %s", e)
         return Response(
             format_api_response(False, message='Failed to get auth status', errors={'detail': str(e)}),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -173,7 +220,7 @@ def get_csrf_token(request):
         JSON response with CSRF token set in cookie
     """
     return Response(
-        format_api_response(True, message='CSRF token set in cookie'),
+        _CSRF_COOKIE_SET_BODY,
         status=status.HTTP_200_OK
     )
 
@@ -192,11 +239,10 @@ def refresh_token(request):
         
         if not refresh_token:
             return Response(
-                format_api_response(False, message='Refresh token is required'),
+                _MISSING_REFRESH_TOKEN_BODY,
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        auth_service = AuthService()
         success, new_access_token = auth_service.cloud_api.refresh_token(refresh_token)
         
         if success:
@@ -212,12 +258,12 @@ def refresh_token(request):
             )
         else:
             return Response(
-                format_api_response(False, message='Invalid refresh token'),
+                _INVALID_REFRESH_TOKEN_BODY,
                 status=status.HTTP_401_UNAUTHORIZED
             )
             
     except Exception as e:
-        logger.error(f"Token refresh failed: {e}")
+        logger.error("Token refresh failed: %s", e)
         return Response(
             format_api_response(False, message=f'Token refresh failed: {str(e)}'),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
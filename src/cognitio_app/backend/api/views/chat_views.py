@@ -5,7 +5,14 @@ Contains view functions for chat sessions and WebLLM integration.
 """
 
 import logging
+import uuid
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -15,22 +22,49 @@ from ..models import ChatSession, ChatMessage
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MESSAGE_PAGE_SIZE = 50
+MAX_MESSAGE_PAGE_SIZE = 200
 
+
+def _session_not_found():
+    return Response({
+        'success': False,
+        'error': 'Session not found'
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+def _invalid_cursor():
+    return Response({
+        'success': False,
+        'error': 'before must be a message id from this session'
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _chat_sessions_etag(request):
+    """
+    ETag for the session list: changes whenever a session is created, deleted,
+    renamed or gets a new message (all of which bump count or updated_at).
+    """
+    stats = ChatSession.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = stats['latest'].timestamp() if stats['latest'] else 0
+    return f"{stats['count']}-{latest}"
+
+
+# Browsers revalidate every time and get a 304 while nothing has changed;
+# a fixed max-age would show a stale list right after creating a session
+@cache_control(private=True, no_cache=True)
+@vary_on_cookie
+@condition(etag_func=_chat_sessions_etag)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_chat_sessions(request):
     """Get chat sessions."""
     try:
-        sessions = ChatSession.objects.all()[:10]  # Limit to 10 recent sessions
-        
-        sessions_data = []
-        for session in sessions:
-            sessions_data.append({
-                'id': str(session.id),
-                'title': session.title,
-                'created_at': session.created_at.isoformat(),
-                'updated_at': session.updated_at.isoformat(),
-            })
+        # Limit to 10 recent sessions; plain dicts skip model instantiation
+        sessions_data = list(
+            ChatSession.objects.order_by('-updated_at')
+            .values('id', 'title', 'created_at', 'updated_at')[:10]
+        )
         
         return Response({
             'success': True,
@@ -38,7 +72,7 @@ def get_chat_sessions(request):
         })
         
     except Exception as e:
-        logger.error(f"Error getting chat sessions: {e}")
+        logger.error("Error getting chat sessions: %s", e)
         return Response({
             'success': False,
             'error': str(e)
@@ -56,15 +90,15 @@ def create_chat_session(request):
         return Response({
             'success': True,
             'session': {
-                'id': str(session.id),
+                'id': session.id,
                 'title': session.title,
-                'created_at': session.created_at.isoformat(),
-                'updated_at': session.updated_at.isoformat()
+                'created_at': session.created_at,
+                'updated_at': session.updated_at
             }
         })
         
     except Exception as e:
-        logger.error(f"Error creating chat session: {e}")
+        logger.error("Error creating chat session: %s", e)
         return Response({
             'success': False,
             'error': str(e)
@@ -74,33 +108,60 @@ def create_chat_session(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_session_messages(request, session_id):
-    """Get messages from a chat session."""
+    """
+    Get messages from a chat session, newest page first.
+    
+    Query params:
+        limit: Page size (default 50, max 200)
+        before: Message id cursor from a previous page's ``next_cursor``
+    """
     try:
-        session = ChatSession.objects.get(id=session_id)
-        messages = ChatMessage.objects.filter(session=session).order_by('created_at')
-        
-        messages_data = []
-        for message in messages:
-            messages_data.append({
-                'id': str(message.id),
-                'message_type': message.message_type,
-                'message': message.message,
-                'response': message.response,
-                'created_at': message.created_at.isoformat()
-            })
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_MESSAGE_PAGE_SIZE)), 1),
+                        MAX_MESSAGE_PAGE_SIZE)
+        except ValueError:
+            return Response({
+                'success': False,
+                'error': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        messages = ChatMessage.objects.filter(session_id=session_id)
+        before = request.query_params.get('before')
+        if before:
+            # Keyset pagination on (created_at, id); the cursor must be a
+            # message of this session
+            try:
+                before = uuid.UUID(before)
+            except ValueError:
+                return _invalid_cursor()
+            cursor_created_at = ChatMessage.objects.filter(
+                session_id=session_id, id=before
+            ).values_list('created_at', flat=True).first()
+            if cursor_created_at is None:
+                return _invalid_cursor()
+            messages = messages.filter(
+                Q(created_at__lt=cursor_created_at)
+                | Q(created_at=cursor_created_at, id__lt=before)
+            )
+        
+        page = list(
+            messages.order_by('-created_at', '-id')
+            .values('id', 'message_type', 'content', 'created_at')[:limit]
+        )
+        if not page and not before and not ChatSession.objects.filter(id=session_id).exists():
+            return _session_not_found()
+        
+        next_cursor = page[-1]['id'] if len(page) == limit else None
+        page.reverse()
         
         return Response({
             'success': True,
-            'messages': messages_data
+            'messages': page,
+            'next_cursor': next_cursor
         })
         
-    except ChatSession.DoesNotExist:
-        return Response({
-            'success': False,
-            'error': 'Session not found'
-        }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Error getting session messages: {e}")
+        logger.error("Error getting session messages: %s", e)
         return Response({
             'success': False,
             'error': str(e)
@@ -110,9 +171,14 @@ def get_session_messages(request, session_id):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def send_chat_message(request, session_id):
-    """Send a message and create a placeholder response."""
+    """
+    Store a message in a chat session.
+    
+    This only persists the message. Generated replies, streamed or not, come
+    from the WebLLM bridge at webllm/chat/ (``stream: true`` for server-sent
+    events).
+    """
     try:
-        session = ChatSession.objects.get(id=session_id)
         content = request.data.get('content')
         message_type = request.data.get('message_type', 'user')
         metadata = request.data.get('metadata', {})
@@ -123,32 +189,31 @@ def send_chat_message(request, session_id):
                 'error': 'Content is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create message record
-        chat_message = ChatMessage.objects.create(
-            session=session,
-            content=content,
-            message_type=message_type,
-            metadata=metadata
-        )
+        # Create message record; the session FK doubles as the existence check
+        try:
+            with transaction.atomic():
+                chat_message = ChatMessage.objects.create(
+                    session_id=session_id,
+                    content=content,
+                    message_type=message_type,
+                    metadata=metadata
+                )
+        except IntegrityError:
+            return _session_not_found()
         
         return Response({
             'success': True,
             'message': {
-                'id': str(chat_message.id),
+                'id': chat_message.id,
                 'content': chat_message.content,
                 'message_type': chat_message.message_type,
                 'metadata': chat_message.metadata,
-                'created_at': chat_message.created_at.isoformat()
+                'created_at': chat_message.created_at
             }
         })
         
-    except ChatSession.DoesNotExist:
-        return Response({
-            'success': False,
-            'error': 'Session not found'
-        }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Error sending chat message: {e}")
+        logger.error("Error sending chat message: %s", e)
         return Response({
             'success': False,
             'error': str(e)
@@ -160,21 +225,17 @@ def send_chat_message(request, session_id):
 def delete_chat_session(request, session_id):
     """Delete a chat session."""
     try:
-        session = ChatSession.objects.get(id=session_id)
-        session.delete()
+        deleted, _ = ChatSession.objects.filter(id=session_id).delete()
+        if not deleted:
+            return _session_not_found()
         
         return Response({
             'success': True,
             'message': 'Session deleted successfully'
         })
         
-    except ChatSession.DoesNotExist:
-        return Response({
-            'success': False,
-            'error': 'Session not found'
-        }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Error deleting chat session: {e}")
+        logger.error("Error deleting chat session: %s", e)
         return Response({
             'success': False,
             'error': str(e)
@@ -186,13 +247,6 @@ def delete_chat_session(request, session_id):
 def update_session_title(request, session_id):
     """Update a chat session title."""
     try:
-        session = ChatSession.objects.get(id=session_id)
-        if not session:
-            return Response({
-                'success': False,
-                'error': 'Session not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-        
         title = request.data.get('title')
         if not title:
             return Response({
@@ -200,21 +254,16 @@ def update_session_title(request, session_id):
                 'error': 'Title is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        session.title = title
-        session.save()
+        if not ChatSession.objects.filter(id=session_id).update(title=title, updated_at=timezone.now()):
+            return _session_not_found()
         
         return Response({
             'success': True,
             'message': 'Title updated successfully'
         })
         
-    except ChatSession.DoesNotExist:
-        return Response({
-            'success': False,
-            'error': 'Session not found'
-        }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
-        logger.error(f"Error updating session title: {e}")
+        logger.error("Error updating session title: %s", e)
         return Response({
             'success': False,
             'error': str(e)
@@ -1,21 +1,28 @@
+import heapq
 import json
 import logging
 import time
 import uuid
-from collections import deque
-from threading import Event, Lock, Timer
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Event, Lock, Thread
 from typing import Dict, Any, Optional, Generator
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.views.decorators.csrf import csrf_exempt
+from django.db import IntegrityError, close_old_connections
 from django.http import StreamingHttpResponse
 
-from ..models.chat import ChatSession, ChatMessage
+from ..models.chat import ChatMessage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +31,13 @@ DEFAULT_WEBLLM_TIMEOUT = 180  # 3 minutes default
 MAX_CONCURRENT_REQUESTS = 10
 CLEANUP_INTERVAL = 300  # 5 minutes
 REQUEST_TTL = 600  # 10 minutes
+ALLOWED_MODELS = frozenset({
+    'Llama-3.2-1B-Instruct',
+    'Llama-3.2-3B-Instruct',
+    'Phi-3.5-mini-instruct',
+    'Qwen2.5-0.5B-Instruct',
+    'Qwen2.5-1.5B-Instruct',
+})
 
 @dataclass
 class WebLLMRequest:
@@ -38,7 +52,9 @@ class WebLLMRequest:
     stream: bool = False
     timeout: int = DEFAULT_WEBLLM_TIMEOUT
     session_id: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: float = field(default_factory=time.time)
+    # time.monotonic() deadline, immune to wall-clock jumps
+    expires_at: float = field(default_factory=lambda: time.monotonic() + REQUEST_TTL)
     status: str = "pending"
     
     def to_dict(self) -> Dict[str, Any]:
@@ -55,7 +71,7 @@ class WebLLMRequest:
                 'stream': self.stream,
                 'timeout': self.timeout
             },
-            'timestamp': self.created_at.timestamp(),
+            'timestamp': self.created_at,
             'status': self.status
         }
 
@@ -67,7 +83,7 @@ class WebLLMResponse:
     error: Optional[str] = None
     usage: Dict[str, Any] = field(default_factory=dict)
     done: bool = False
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: float = field(default_factory=time.time)
 
 class WebLLMBridgeManager:
     """
@@ -82,42 +98,53 @@ class WebLLMBridgeManager:
         self._response_queues: Dict[str, deque] = {}
         self._completion_events: Dict[str, Event] = {}
         self._lock = Lock()
-        self._cleanup_timer: Optional[Timer] = None
-        self._start_cleanup_timer()
+        # Streaming requests: notified (under _lock) when a chunk is queued or
+        # the request goes away, so streams block instead of polling
+        self._chunk_conditions: Dict[str, Condition] = {}
+        # Ids of requests still in 'pending', in creation order (dict as ordered set)
+        self._pending_ids: Dict[str, None] = {}
+        # (expires_at, request_id) min-heap; ids removed early are skipped lazily
+        self._expiry_heap: list[tuple[float, str]] = []
+        # Live requests per status, kept in step with every status change
+        self._status_counts: Counter = Counter()
+        self._stop_event = Event()
+        self._cleanup_thread = Thread(target=self._cleanup_loop, name='webllm-bridge-cleanup', daemon=True)
+        self._cleanup_thread.start()
     
-    def _start_cleanup_timer(self):
-        """Start periodic cleanup of expired requests"""
-        if self._cleanup_timer:
-            self._cleanup_timer.cancel()
-        self._cleanup_timer = Timer(CLEANUP_INTERVAL, self._cleanup_expired_requests)
-        self._cleanup_timer.daemon = True
-        self._cleanup_timer.start()
+    def _cleanup_loop(self):
+        """Periodically clean up expired requests for the life of the process"""
+        while not self._stop_event.wait(CLEANUP_INTERVAL):
+            try:
+                self._cleanup_expired_requests()
+            except Exception as e:
+                logger.error(f"Error during cleanup: {e}")
     
     def _cleanup_expired_requests(self):
         """Clean up requests older than TTL"""
-        try:
-            with self._lock:
-                now = datetime.now()
-                expired_ids = [
-                    req_id for req_id, req in self._requests.items()
-                    if (now - req.created_at).total_seconds() > REQUEST_TTL
-                ]
-                
-                for req_id in expired_ids:
+        with self._lock:
+            now = time.monotonic()
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, req_id = heapq.heappop(self._expiry_heap)
+                if req_id in self._requests:
                     self._remove_request(req_id)
                     logger.info(f"Cleaned up expired WebLLM request {req_id}")
-                    
-            # Restart cleanup timer
-            self._start_cleanup_timer()
-            
-        except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
-            self._start_cleanup_timer()
+    
+    def _set_status(self, request: WebLLMRequest, status: str):
+        """Change a request's status (must be called with lock held)"""
+        self._status_counts[request.status] -= 1
+        self._status_counts[status] += 1
+        request.status = status
     
     def _remove_request(self, request_id: str):
         """Remove a request and all associated data (must be called with lock held)"""
-        self._requests.pop(request_id, None)
+        request = self._requests.pop(request_id, None)
+        if request is not None:
+            self._status_counts[request.status] -= 1
+        self._pending_ids.pop(request_id, None)
         self._response_queues.pop(request_id, None)
+        condition = self._chunk_conditions.pop(request_id, None)
+        if condition is not None:
+            condition.notify_all()  # Let a waiting stream see the removal
         if request_id in self._completion_events:
             self._completion_events[request_id].set()  # Unblock any waiters
             self._completion_events.pop(request_id, None)
@@ -141,17 +168,21 @@ class WebLLMBridgeManager:
         
         with self._lock:
             if len(self._requests) >= MAX_CONCURRENT_REQUESTS:
-                # Clean up oldest requests if at capacity
-                oldest_id = min(self._requests.keys(), 
-                              key=lambda x: self._requests[x].created_at)
+                # Clean up oldest requests if at capacity; dicts keep insertion
+                # order, so the first key is the oldest request
+                oldest_id = next(iter(self._requests))
                 self._remove_request(oldest_id)
                 logger.warning(f"Removed oldest request {oldest_id} due to capacity limit")
             
             self._requests[request_id] = webllm_request
+            self._pending_ids[request_id] = None
+            self._status_counts[webllm_request.status] += 1
+            heapq.heappush(self._expiry_heap, (webllm_request.expires_at, request_id))
             self._completion_events[request_id] = Event()
             
             if webllm_request.stream:
                 self._response_queues[request_id] = deque()
+                self._chunk_conditions[request_id] = Condition(self._lock)
         
         logger.info(f"Created WebLLM request {request_id} for model {webllm_request.model}")
         return webllm_request
@@ -159,13 +190,14 @@ class WebLLMBridgeManager:
     def get_pending_requests(self) -> list[WebLLMRequest]:
         """Get all pending requests for frontend polling"""
         with self._lock:
-            return [req for req in self._requests.values() if req.status == 'pending']
+            return [self._requests[req_id] for req_id in self._pending_ids]
     
     def mark_processing(self, request_id: str) -> bool:
         """Mark a request as being processed"""
         with self._lock:
             if request_id in self._requests:
-                self._requests[request_id].status = 'processing'
+                self._set_status(self._requests[request_id], 'processing')
+                self._pending_ids.pop(request_id, None)
                 return True
             return False
     
@@ -182,10 +214,12 @@ class WebLLMBridgeManager:
                 # For streaming requests, add to queue
                 if request_id in self._response_queues:
                     self._response_queues[request_id].append(response)
+                    self._chunk_conditions[request_id].notify_all()
                     # Signal completion only for final response
                     if response.done or response.error:
                         self._completion_events[request_id].set()
-                        request.status = 'completed'
+                        self._set_status(request, 'completed')
+                        self._pending_ids.pop(request_id, None)
                 else:
                     logger.error(f"No response queue for streaming request {request_id}")
                     return False
@@ -193,7 +227,8 @@ class WebLLMBridgeManager:
                 # For non-streaming, signal completion immediately
                 self._response_queues[request_id] = deque([response])
                 self._completion_events[request_id].set()
-                request.status = 'completed'
+                self._set_status(request, 'completed')
+                self._pending_ids.pop(request_id, None)
             
             logger.debug(f"Response submitted for request {request_id}")
             return True
@@ -220,6 +255,26 @@ class WebLLMBridgeManager:
                 return queue.popleft()
             return None
     
+    def wait_for_responses(self, request_id: str, timeout: float) -> Optional[list[WebLLMResponse]]:
+        """
+        Block until a streaming request has queued responses, then drain them.
+        
+        Returns the drained responses (empty on timeout), or None once the
+        request no longer exists.
+        """
+        with self._lock:
+            condition = self._chunk_conditions.get(request_id)
+            if condition is None:
+                return None
+            queue = self._response_queues[request_id]
+            if not queue:
+                condition.wait(timeout=timeout)
+                if request_id not in self._chunk_conditions:
+                    return None
+            responses = list(queue)
+            queue.clear()
+            return responses
+    
     def get_final_response(self, request_id: str) -> Optional[WebLLMResponse]:
         """Get the final response for a non-streaming request"""
         with self._lock:
@@ -244,14 +299,9 @@ class WebLLMBridgeManager:
     def get_status(self) -> Dict[str, Any]:
         """Get current bridge status"""
         with self._lock:
-            requests_by_status = {}
-            for req in self._requests.values():
-                status = req.status
-                requests_by_status[status] = requests_by_status.get(status, 0) + 1
-            
             return {
                 'total_requests': len(self._requests),
-                'requests_by_status': requests_by_status,
+                'requests_by_status': dict(+self._status_counts),
                 'max_concurrent': MAX_CONCURRENT_REQUESTS,
                 'bridge_active': True
             }
@@ -328,14 +378,7 @@ def webllm_chat(request):
     content = (request.data.get('content') or request.data.get('user_message') or '').strip()
     system_prompt = request.data.get('system_prompt', 'You are a helpful AI assistant.')
     model = request.data.get('model', 'Llama-3.2-1B-Instruct')
-    allowed_models = [
-        'Llama-3.2-1B-Instruct',
-        'Llama-3.2-3B-Instruct',
-        'Phi-3.5-mini-instruct',
-        'Qwen2.5-0.5B-Instruct',
-        'Qwen2.5-1.5B-Instruct'
-    ]
-    if model not in allowed_models:
+    if model not in ALLOWED_MODELS:
         model = 'Llama-3.2-1B-Instruct'
 
     if not content:
@@ -346,30 +389,7 @@ def webllm_chat(request):
     try:
         logger.info(f"WebLLM chat request: {content[:100]}..., model: {model}")
         
-        # If streaming is requested, handle via streaming response
-        if request.data.get('stream', False):
-            # Create streaming request
-            webllm_request = bridge_manager.create_request({
-                'type': 'chat',
-                'content': content,
-                'system_prompt': system_prompt,
-                'model': model,
-                'temperature': request.data.get('temperature', 0.7),
-                'max_tokens': request.data.get('max_tokens', 4096),
-                'stream': True,
-                'timeout': request.data.get('timeout', DEFAULT_WEBLLM_TIMEOUT),
-                'session_id': request.data.get('session_id')
-            })
-            
-            # Return streaming response
-            response = StreamingHttpResponse(
-                stream_webllm_response(webllm_request),
-                content_type='text/plain'
-            )
-            response['Cache-Control'] = 'no-cache'
-            return response
-        
-        # For non-streaming, use the bridge system
+        stream = bool(request.data.get('stream', False))
         webllm_request = bridge_manager.create_request({
             'type': 'chat',
             'content': content,
@@ -377,11 +397,21 @@ def webllm_chat(request):
             'model': model,
             'temperature': request.data.get('temperature', 0.7),
             'max_tokens': request.data.get('max_tokens', 4096),
-            'stream': False,  # Non-streaming through bridge
+            'stream': stream,
             'timeout': request.data.get('timeout', DEFAULT_WEBLLM_TIMEOUT),
             'session_id': request.data.get('session_id')
         })
         
+        # If streaming is requested, handle via streaming response
+        if stream:
+            # Return streaming response
+            response = StreamingHttpResponse(
+                stream_webllm_response(webllm_request),
+                content_type='text/plain'
+            )
+            response['Cache-Control'] = 'no-cache'
+            return response
+        
         # Non-streaming response - wait for completion
         if bridge_manager.wait_for_completion(webllm_request.request_id, webllm_request.timeout):
             response = bridge_manager.get_final_response(webllm_request.request_id)
@@ -394,7 +424,7 @@ def webllm_chat(request):
             # Save chat messages to session if provided
             try:
                 if webllm_request.session_id:
-                    save_chat_messages(webllm_request, response)
+                    _save_executor.submit(_save_chat_messages_job, webllm_request, response)
             except Exception as e:
                 logger.error(f"Error saving chat message: {e}")
             
@@ -419,37 +449,56 @@ def save_chat_messages(webllm_request: WebLLMRequest, response: Optional[WebLLMR
     if not webllm_request.session_id:
         return
     
-    try:
-        session = ChatSession.objects.get(id=webllm_request.session_id)
-        
-        # Save user message
-        ChatMessage.objects.create(
-            session=session,
+    messages = [
+        ChatMessage(
             message_type='user',
             content=webllm_request.content,
             metadata={'model': webllm_request.model}
         )
-        
-        # Save assistant response if available
-        if response and response.content:
-            ChatMessage.objects.create(
-                session=session,
-                message_type='assistant',
-                content=response.content,
-                tokens_used=response.usage.get('total_tokens', 0) if response.usage else 0,
-                metadata={
-                    'model': webllm_request.model,
-                    'usage': response.usage
-                }
-            )
-            
-    except ChatSession.DoesNotExist:
+    ]
+    
+    # Save assistant response if available
+    if response and response.content:
+        messages.append(ChatMessage(
+            message_type='assistant',
+            content=response.content,
+            tokens_used=response.usage.get('total_tokens', 0) if response.usage else 0,
+            metadata={
+                'model': webllm_request.model,
+                'usage': response.usage
+            }
+        ))
+    
+    try:
+        # One INSERT for the pair; the session FK doubles as the existence check
+        ChatMessage.bulk_create_for_session(webllm_request.session_id, messages)
+    except IntegrityError:
         logger.warning(f"Chat session {webllm_request.session_id} not found")
     except Exception as e:
         logger.error(f"Error saving chat messages: {e}")
 
 
-def stream_webllm_response(webllm_request: WebLLMRequest) -> Generator[str, None, None]:
+# Chat history is written after the reply has been sent, off the request thread
+_save_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='webllm-save')
+
+
+def _save_chat_messages_job(webllm_request: WebLLMRequest, response: Optional[WebLLMResponse]):
+    """Run save_chat_messages on a worker thread with its own DB connection"""
+    close_old_connections()
+    try:
+        save_chat_messages(webllm_request, response)
+    finally:
+        close_old_connections()
+
+
+def _sse_event(payload: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event carrying ``payload`` as JSON"""
+    if orjson is not None:
+        return b"data: " + orjson.dumps(payload) + b"\n\n"
+    return f"data: {json.dumps(payload)}\n\n".encode()
+
+
+def stream_webllm_response(webllm_request: WebLLMRequest) -> Generator[bytes, None, None]:
     """
     Stream WebLLM responses in real-time
     
@@ -460,67 +509,66 @@ def stream_webllm_response(webllm_request: WebLLMRequest) -> Generator[str, None
     
     try:
         last_activity = start_time
-        poll_interval = 0.2  # 200ms polling - more responsive
         response_received = False
+        finished = False
         
-        while True:
-            elapsed = time.time() - start_time
+        while not finished:
+            now = time.time()
+            elapsed = now - start_time
             
             # Check for timeout
             if elapsed >= webllm_request.timeout:
                 logger.warning(f"Stream timeout after {elapsed:.1f}s for request {webllm_request.request_id}")
-                yield f"data: {json.dumps({'error': f'Request timed out after {elapsed:.1f} seconds'})}\n\n"
+                yield _sse_event({'error': f'Request timed out after {elapsed:.1f} seconds'})
+                break
+            
+            # More lenient timeout for initial response
+            max_inactive_time = 30 if not response_received else 10
+            time_since_activity = now - last_activity
+            
+            if time_since_activity > max_inactive_time:
+                logger.warning(f"Stream inactive for {time_since_activity:.1f}s for request {webllm_request.request_id}")
+                yield _sse_event({'error': f'Stream inactive for {time_since_activity:.1f} seconds. Please ensure WebLLM is initialized in your browser.'})
                 break
             
-            # Get next response chunk
-            response = bridge_manager.get_response(webllm_request.request_id)
+            # Sleep until the frontend submits chunks (or a deadline passes)
+            wait_time = min(webllm_request.timeout - elapsed, max_inactive_time - time_since_activity)
+            responses = bridge_manager.wait_for_responses(webllm_request.request_id, max(wait_time, 0) + 0.01)
+            
+            if responses is None:
+                logger.info(f"Request {webllm_request.request_id} no longer exists, ending stream")
+                break
             
-            if response is not None:
+            if responses:
                 last_activity = time.time()
                 response_received = True
-                
+            
+            for response in responses:
                 if response.error:
                     logger.error(f"Stream error for {webllm_request.request_id}: {response.error}")
-                    yield f"data: {json.dumps({'error': response.error})}\n\n"
+                    yield _sse_event({'error': response.error})
+                    finished = True
                     break
                 elif response.content:
-                    yield f"data: {json.dumps({'delta': response.content})}\n\n"
+                    yield _sse_event({'delta': response.content})
                     
                     if response.done:
                         logger.info(f"Stream completed for {webllm_request.request_id}")
                         # Final usage information
                         if response.usage:
-                            yield f"data: {json.dumps({'usage': response.usage})}\n\n"
+                            yield _sse_event({'usage': response.usage})
                         
                         # Save chat messages for completed requests
                         try:
-                            save_chat_messages(webllm_request, response)
+                            _save_executor.submit(_save_chat_messages_job, webllm_request, response)
                         except Exception as e:
                             logger.error(f"Error saving chat messages: {e}")
+                        finished = True
                         break
-            else:
-                # No new response, check if we should continue waiting
-                time_since_activity = time.time() - last_activity
-                
-                # More lenient timeout for initial response
-                max_inactive_time = 30 if not response_received else 10
-                
-                if time_since_activity > max_inactive_time:
-                    logger.warning(f"Stream inactive for {time_since_activity:.1f}s for request {webllm_request.request_id}")
-                    yield f"data: {json.dumps({'error': f'Stream inactive for {time_since_activity:.1f} seconds. Please ensure WebLLM is initialized in your browser.'})}\n\n"
-                    break
-                
-                # Check if request still exists
-                if webllm_request.request_id not in bridge_manager._requests:
-                    logger.info(f"Request {webllm_request.request_id} no longer exists, ending stream")
-                    break
-                
-                # Wait before next poll
-                time.sleep(poll_interval)
                 
     except Exception as e:
         logger.error(f"Error in stream for request {webllm_request.request_id}: {e}")
-        yield f"data: {json.dumps({'error': f'Stream error: {str(e)}'})}\n\n"
+        yield _sse_event({'error': f'Stream error: {str(e)}'})
         
     finally:
         # Clean up the request
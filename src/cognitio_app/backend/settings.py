@@ -40,6 +40,9 @@ if DEBUG and not ALLOWED_HOSTS:
 
 BACKEND_URL = os.environ.get('BACKEND_URL', 'http://localhost:3927')
 
+# Briefly cache successful cloud token validations and refreshes
+CACHE_JWT_VALIDATION = os.environ.get('CACHE_JWT_VALIDATION', 'True').lower() == 'true'
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -107,9 +110,17 @@ if database_url.startswith('sqlite:'):
     }
 elif database_url.startswith('postgresql:'):
     # PostgreSQL configuration (requires psycopg2)
+    # Behind a real WSGI/ASGI server, keep connections open between requests
+    # instead of reconnecting (TCP + auth handshake) each time; health checks
+    # drop ones the server closed. The bundled runserver closes every
+    # connection after each request, so this has no effect there
     import dj_database_url
     DATABASES = {
-        'default': dj_database_url.parse(database_url)
+        'default': dj_database_url.parse(
+            database_url,
+            conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '600')),
+            conn_health_checks=True,
+        )
     }
 else:
     # Default to SQLite
@@ -176,6 +187,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'cognitio_app.backend.api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
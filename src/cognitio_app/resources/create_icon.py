@@ -4,44 +4,102 @@ Create a simple placeholder icon for WebLLM Chat application.
 This script creates a basic PNG icon that can be used during development.
 """
 
+import io
 import os
 from pathlib import Path
 
+# Smaller variants downscaled from the 256px master, saved next to it as
+# LOGO-light-vertical-<size>.png (the naming Briefcase looks for)
+ICON_SIZES = (16, 32, 64, 128)
+
+# Palette indices used to draw the placeholder
+BACKGROUND, WHITE, OUTLINE = 0, 1, 2
+PALETTE = [
+    0x8F, 0x4A, 0xCF,  # BACKGROUND '#8F4ACF'
+    0xFF, 0xFF, 0xFF,  # WHITE '#ffffff'
+    0x7C, 0x3A, 0xED,  # OUTLINE '#7C3AED'
+]
+
+
+def _encode_png(img):
+    """Encode an image as PNG bytes, keeping a palette when it is lossless."""
+    from PIL import Image
+    
+    # Flat drawings use only a handful of colours, so an adaptive palette is
+    # lossless and deflates 1 byte/pixel instead of 3
+    colors = img.getcolors(256) if img.mode == 'RGB' else None
+    if colors is not None:
+        img = img.convert('P', palette=Image.Palette.ADAPTIVE, colors=len(colors))
+    buf = io.BytesIO()
+    img.save(buf, 'PNG', compress_level=1)
+    png_bytes = buf.getvalue()
+    
+    # Recompress losslessly with oxipng (pyoxipng) when it is installed
+    try:
+        import oxipng
+        png_bytes = oxipng.optimize_from_memory(png_bytes, level=4)
+    except ImportError:
+        pass
+    return png_bytes
+
+
 def create_simple_icon():
     """Create a simple icon using PIL if available, otherwise create an empty file."""
     icon_path = Path(__file__).parent / "LOGO-light-vertical.png"
     
+    targets = {256: icon_path}
+    for n in ICON_SIZES:
+        targets[n] = icon_path.with_stem(f"{icon_path.stem}-{n}")
+    
+    # Never redraw (or overwrite) icons that are already in place
+    missing = {n: path for n, path in targets.items()
+               if not (path.exists() and path.stat().st_size > 0)}
+    if not missing:
+        print(f"ℹ️  Icon already exists: {icon_path}")
+        return True
+    
     try:
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Create a 256x256 image with purple background
-        size = (256, 256)
-        img = Image.new('RGB', size, color='#8F4ACF')
-        draw = ImageDraw.Draw(img)
-        
-        # Draw a simple robot icon
-        # Head circle
-        draw.ellipse([64, 64, 192, 192], fill='#ffffff', outline='#7C3AED', width=4)
-        
-        # Eyes
-        draw.ellipse([88, 100, 112, 124], fill='#8F4ACF')
-        draw.ellipse([144, 100, 168, 124], fill='#8F4ACF')
+        from PIL import Image, ImageDraw
         
-        # Mouth
-        draw.arc([100, 140, 156, 170], start=0, end=180, fill='#8F4ACF', width=4)
+        if 256 in missing:
+            # Create a 256x256 palette image (1 byte/pixel) with purple background
+            size = (256, 256)
+            img = Image.new('P', size, BACKGROUND)
+            img.putpalette(PALETTE)
+            draw = ImageDraw.Draw(img)
+            
+            # Draw a simple robot icon
+            # Head circle
+            draw.ellipse([64, 64, 192, 192], fill=WHITE, outline=OUTLINE, width=4)
+            
+            # Eyes
+            draw.ellipse([88, 100, 112, 124], fill=BACKGROUND)
+            draw.ellipse([144, 100, 168, 124], fill=BACKGROUND)
+            
+            # Mouth
+            draw.arc([100, 140, 156, 170], start=0, end=180, fill=BACKGROUND, width=4)
+        else:
+            # Downscale from the existing master so the variants match it
+            img = Image.open(icon_path).convert('RGB')
         
-        # Save the icon
-        img.save(icon_path, 'PNG')
-        print(f"✅ Created icon: {icon_path}")
+        # Draw once at 256 and downscale for the smaller sizes; LANCZOS
+        # needs real colours, so resample from an RGB copy
+        rgb = img.convert('RGB') if img.mode != 'RGB' else img
+        for n, path in missing.items():
+            sized = img if n == 256 else rgb.resize((n, n), Image.Resampling.LANCZOS)
+            path.write_bytes(_encode_png(sized))
+            print(f"✅ Created icon: {path}")
         return True
         
     except ImportError:
         # PIL not available, create a simple text-based icon description
         try:
-            with open(icon_path.with_suffix('.txt'), 'w') as f:
-                f.write("WebLLM Chat Icon Placeholder\n")
-                f.write("This is a placeholder for the application icon.\n")
-                f.write("Replace with actual icon file in PNG, ICO, or ICNS format.\n")
+            with open(icon_path.with_suffix('.txt'), 'w', encoding='utf-8') as f:
+                f.write(
+                    "WebLLM Chat Icon Placeholder\n"
+                    "This is a placeholder for the application icon.\n"
+                    "Replace with actual icon file in PNG, ICO, or ICNS format.\n"
+                )
             print(f"ℹ️  Created icon placeholder: {icon_path.with_suffix('.txt')}")
         except Exception as e:
             print(f"⚠️  Could not create icon placeholder: {e}")